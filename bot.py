@@ -1,11 +1,160 @@
-from typing import Tuple, Optional, List
-from game_settings import Snake, Food, Direction, get_distance, is_safe, Trap, GRID_WIDTH, GRID_HEIGHT
+from typing import Tuple, Optional, List, Dict
+from game_settings import Snake, Food, Direction, Trap, GRID_WIDTH, GRID_HEIGHT
 import random
+import heapq
 import math
 from collections import deque
-import heapq
+from itertools import islice
+from types import SimpleNamespace
+from operator import itemgetter
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait
+import atexit
+import os
 import time
 
+# The four grid moves, in the order the bots try them
+_MOVES = (Direction.RIGHT, Direction.LEFT, Direction.DOWN, Direction.UP)
+_OPPOSITE = {m: Direction.opposite(m) for m in _MOVES}
+# Moves available when heading in a direction (everything but a 180-degree turn)
+_MOVES_FROM = {d: tuple(m for m in _MOVES if m != _OPPOSITE[d]) for d in _MOVES}
+# Placeholder move for a boxed-in opponent in the search; compared by identity
+_STAY = (0, 0)
+
+# Flat cell layout used by the search: cell (x, y) is x * _STRIDE + y, column by column. The spare
+# row ending each column and the spare column after the last one are walls, so a step off the grid
+# lands on a blocked cell with no bounds check (negative indices from x = -1 or (0, -1) wrap
+# around to the spare column)
+_STRIDE = GRID_HEIGHT + 1
+_CELLS = (GRID_WIDTH + 1) * _STRIDE
+_BORDER_GRID = bytearray(int(x == GRID_WIDTH or y == GRID_HEIGHT) for x in range(GRID_WIDTH + 1) for y in range(_STRIDE))
+# Each move in _MOVES with its flat index offset
+_STEPS = tuple((m, m[0] * _STRIDE + m[1]) for m in _MOVES)
+# (x, y) of each flat cell index, so the search never has to divmod an index back
+_CELL_XY = tuple(divmod(i, _STRIDE) for i in range(_CELLS))
+
+def _d2(a, b) -> int:
+    """Squared distance; use wherever distances are only compared"""
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    return dx * dx + dy * dy
+
+def _nearest(pos, positions):
+    """Closest of positions to pos (first one on ties) in a single pass, or None"""
+    px, py = pos[0], pos[1]
+    best, best_d2 = None, float('inf')
+    for p in positions:
+        dx = p[0] - px
+        dy = p[1] - py
+        d2 = dx * dx + dy * dy
+        if d2 < best_d2:
+            best, best_d2 = p, d2
+    return best
+
+def _two_nearest(pos, positions) -> list:
+    """The (up to) two closest of positions to pos, nearest first and in input order on ties"""
+    px, py = pos[0], pos[1]
+    first = second = None
+    first_d2 = second_d2 = float('inf')
+    for p in positions:
+        dx = p[0] - px
+        dy = p[1] - py
+        d2 = dx * dx + dy * dy
+        if d2 < second_d2:
+            if d2 < first_d2:
+                second, second_d2 = first, first_d2
+                first, first_d2 = p, d2
+            else:
+                second, second_d2 = p, d2
+    return [p for p in (first, second) if p is not None]
+
+# Zobrist keys per flat cell for the channels
+# (my body, my head, opponent body, opponent head)
+_zobrist_rng = random.Random(0x5EED)
+_ZOBRIST = [tuple(_zobrist_rng.getrandbits(64) for _ in range(4)) for _ in range(_CELLS)]
+# Transposition table entry flags
+_TT_EXACT, _TT_LOWER, _TT_UPPER = 0, 1, 2
+_TT_MAX_ENTRIES = 50000
+# Per-cell squared distance to the nearest food, filled lazily during a decision (-1 = not computed yet)
+_FOOD_D2_UNSET = array('d', [-1.0]) * _CELLS
+# Per-cell A* cost before a cell is reached; no path on the grid is this long
+_ASTAR_G_UNSET = [_CELLS] * _CELLS
+# Offsets within the trap penalty radius (squared distance < 16), with their squared distance
+_TRAP_RADIUS = tuple((dx, dy, dx * dx + dy * dy) for dx in range(-3, 4) for dy in range(-3, 4) if dx * dx + dy * dy < 16)
+
+def _trap_d2_grid(traps) -> array:
+    """Squared distance from each cell to its nearest trap, or inf beyond the penalty radius"""
+    grid = array('d', [float('inf')]) * _CELLS
+    for tx, ty in traps:
+        for dx, dy, d2 in _TRAP_RADIUS:
+            x, y = tx + dx, ty + dy
+            if 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT and d2 < grid[x * _STRIDE + y]:
+                grid[x * _STRIDE + y] = d2
+    return grid
+
+# Maps an occupancy byte to '1' when the cell is empty and '0' otherwise
+_FREE_DIGITS = b'1' + b'0' * 255
+
+def _free_bits(grid: bytearray) -> int:
+    """Bitboard of the empty cells of a flat occupancy grid"""
+    return int(grid.translate(_FREE_DIGITS)[::-1], 2)
+
+def _position_grid(my_body, opp_body) -> Tuple[bytearray, int, int]:
+    """Occupancy counts, free-cell bitboard and Zobrist hash of two bodies given head first"""
+    occ = bytearray(_BORDER_GRID)
+    h = 0
+    for channel, body in ((0, my_body), (2, opp_body)):
+        for s in body:
+            i = s[0] * _STRIDE + s[1]
+            occ[i] += 1
+            h ^= _ZOBRIST[i][channel]
+        if body:
+            h ^= _ZOBRIST[body[0][0] * _STRIDE + body[0][1]][channel + 1]
+    return occ, _free_bits(occ), h
+
+# The ring of cells just outside the grid, so one step off a valid cell needs no bounds check
+_BORDER = frozenset([(x, y) for x in (-1, GRID_WIDTH) for y in range(-1, GRID_HEIGHT + 1)]
+                    + [(x, y) for x in range(GRID_WIDTH) for y in (-1, GRID_HEIGHT)])
+
+def _blocked_cells(snake: Snake, other: Optional[Snake] = None) -> set:
+    """Cells that is_safe(snake, pos, other) rejects (plus the border ring), built once per decision"""
+    blocked = set(_BORDER)
+    blocked.update(islice(snake.segments, 1, None))
+    if other:
+        blocked.update(other.segments)
+    return blocked
+
+def _is_free(pos: Tuple[int, int], blocked: set) -> bool:
+    """Set-backed equivalent of is_safe for a tuple position"""
+    return 0 <= pos[0] < GRID_WIDTH and 0 <= pos[1] < GRID_HEIGHT and pos not in blocked
+
+# Worker pools for scoring root moves in parallel, one per pool size, started on first use
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+
+def _root_pool(workers: int) -> ProcessPoolExecutor:
+    workers = min(workers, os.cpu_count() or 1)
+    if workers not in _POOLS:
+        _POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _POOLS[workers]
+
+@atexit.register
+def _shutdown_root_pools() -> None:
+    for pool in _POOLS.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _POOLS.clear()
+
+# CustomBot settings a root search reads; workers get these instead of the pickled bot and its scratch arrays
+_SEARCH_PARAMS = ("food_weight", "area_weight", "danger_weight", "length_weight", "astar_bonus", "trap_penalty",
+                  "beam_width", "beam_min_depth", "max_astar_nodes", "max_bfs_nodes", "time_budget")
+
+def _score_move_worker(params, my_segments, shield_timer, opp_segments, move, depth, start_time, traps_set, food_list, opp_pred) -> float:
+    """Score one root move in a worker process from a snapshot of the position (top level so it pickles)"""
+    bot = CustomBot()
+    bot.__dict__.update(params)
+    me = SimpleNamespace(segments=my_segments, shield_timer=shield_timer)
+    opp = SimpleNamespace(segments=opp_segments, alive=bool(opp_segments))
+    return bot._minimax_score(me, opp, None, None, move, depth, start_time, traps_set, food_list, opp_pred)
+
 class Bot:
     """
     Base class for all snake agents.
@@ -43,9 +192,11 @@ class RandomBot(Bot):
         self.name = "RandomBot"
     
     def decide_move(self, snake, food, opponent=None):
-        possible_moves = [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]
-        possible_moves = [m for m in possible_moves if m != Direction.opposite(snake.direction)]
-        return random.choice(possible_moves)
+        # Two random bits give an index; redraw the unused fourth value to stay uniform
+        i = random.getrandbits(2)
+        while i == 3:
+            i = random.getrandbits(2)
+        return _MOVES_FROM[snake.direction][i]
 
 class GreedyBot(Bot):
     """Goes for nearest food"""
@@ -55,49 +206,53 @@ class GreedyBot(Bot):
     
     def decide_move(self, snake, food, opponent=None):
         head_pos = snake.get_head_position()
+        hx, hy = head_pos
         current_dir = snake.direction
 
         if not food.positions:
             return current_dir
 
         # Find closest food
-        closest_food = min(food.positions, key=lambda pos: get_distance(head_pos, pos))
+        closest_food = _nearest(head_pos, food.positions)
 
-        possible_moves = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        possible_moves = [move for move in possible_moves if move != (-current_dir[0], -current_dir[1])]
+        possible_moves = _MOVES_FROM[current_dir]
 
         best_move = current_dir
         best_score = -float('inf')
+        blocked = _blocked_cells(snake, opponent)
+        # Only a longer (or equal) live opponent is a threat; its next head assumes it keeps going straight
+        threat_head = None
+        if opponent and opponent.alive and len(opponent.segments) >= len(snake.segments):
+            threat_head = opponent.get_head_position()
+            predicted_other_head = (threat_head[0] + opponent.direction[0], threat_head[1] + opponent.direction[1])
 
         for move in possible_moves:
-            new_head = [head_pos[0] + move[0], head_pos[1] + move[1]]
-            if not is_safe(snake, new_head, opponent):
+            new_head = (hx + move[0], hy + move[1])
+            if new_head in blocked:
                 continue
 
             # Calculate food proximity score
-            food_dist = get_distance(new_head, closest_food)
+            food_dist = math.hypot(new_head[0] - closest_food[0], new_head[1] - closest_food[1])
             food_score = 1 / (food_dist + 1e-5) * 100  # Avoid division by zero
+            # Danger only subtracts, so skip moves that cannot win even with full mobility
+            if food_score + 3 * 15 <= best_score:
+                continue
 
             # Calculate mobility score
             mobility = 0
-            next_moves = [m for m in [(1,0), (-1,0), (0,1), (0,-1)] if m != (-move[0], -move[1])]
-            for next_move in next_moves:
-                next_head_pos = [new_head[0] + next_move[0], new_head[1] + next_move[1]]
-                if is_safe(snake, next_head_pos, opponent):
+            for next_move in _MOVES_FROM[move]:
+                next_head_pos = (new_head[0] + next_move[0], new_head[1] + next_move[1])
+                if next_head_pos not in blocked:
                     mobility += 1
+            if food_score + mobility * 15 <= best_score:
+                continue
 
             # Calculate danger score
             danger = 0
-            if opponent and opponent.alive:
-                other_head = opponent.get_head_position()
-                dist_to_other = get_distance(new_head, other_head)
-                if dist_to_other < 4 and len(opponent.segments) >= len(snake.segments):
-                    danger = 1
-                    # Predict other snake's movement
-                    other_dir = opponent.direction
-                    predicted_other_head = [other_head[0] + other_dir[0], other_head[1] + other_dir[1]]
-                    if new_head == predicted_other_head:
-                        danger += 1
+            if threat_head is not None and _d2(new_head, threat_head) < 16:
+                danger = 1
+                if new_head == predicted_other_head:
+                    danger += 1
 
             total_score = food_score + mobility * 15 - danger * 100
             if total_score > best_score:
@@ -115,64 +270,72 @@ class StrategicBot(Bot):
     
     def decide_move(self, snake, food, opponent=None):
         head_pos = snake.get_head_position()
+        hx, hy = head_pos
         current_dir = snake.direction
 
         if not food.positions:
             return current_dir
 
         # Find safest food considering other snake
-        food_scores = []
-        for f in food.positions:
-            base_score = 1 / (get_distance(head_pos, f) + 1e-5)
+        other_head = opponent.get_head_position() if opponent else None
+        target_food = None
+        best_food_score = -1.0
+        for fpos in food.positions:
+            fx, fy = fpos
+            base_score = 1 / (math.hypot(hx - fx, hy - fy) + 1e-5)
             # Penalize food close to other snake
-            if opponent:
-                other_dist = get_distance(f, opponent.get_head_position())
+            if other_head is not None:
+                other_dist = math.hypot(fx - other_head[0], fy - other_head[1])
                 base_score *= max(0.1, 1 - (1 / (other_dist + 1)))
-            food_scores.append(base_score)
-        target_food = food.positions[food_scores.index(max(food_scores))]
+            if base_score > best_food_score:
+                best_food_score = base_score
+                target_food = fpos
 
-        possible_moves = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        possible_moves = [move for move in possible_moves if move != (-current_dir[0], -current_dir[1])]
+        possible_moves = _MOVES_FROM[current_dir]
 
         best_move = current_dir
         best_score = -float('inf')
+        blocked = _blocked_cells(snake, opponent)
+        # Most the danger term can add to a move's score (a cornered opponent)
+        max_bonus = 0
+        if opponent and opponent.alive:
+            # Opponent's straight-line course over its next 3 moves, and the space at its end
+            ox, oy = other_head
+            odx, ody = opponent.direction
+            other_path = {(ox + k * odx, oy + k * ody) for k in range(1, 4)}
+            end_x, end_y = ox + 3 * odx, oy + 3 * ody
+            opp_blocked = _blocked_cells(opponent, snake)
+            other_space = sum(1 for m in _MOVES if _is_free((end_x + m[0], end_y + m[1]), opp_blocked))
+            if other_space <= 1:
+                max_bonus = 150
 
         for move in possible_moves:
-            new_head = [head_pos[0] + move[0], head_pos[1] + move[1]]
-            if not is_safe(snake, new_head, opponent):
+            new_head = (hx + move[0], hy + move[1])
+            if new_head in blocked:
                 continue
 
             # Food proximity
-            food_dist = get_distance(new_head, target_food)
+            food_dist = math.hypot(new_head[0] - target_food[0], new_head[1] - target_food[1])
             food_score = 1 / (food_dist + 1e-5) * 100
+            if food_score + 3 * 20 + max_bonus <= best_score:
+                continue
 
             # Mobility
             mobility = 0
-            next_moves = [m for m in [(1,0), (-1,0), (0,1), (0,-1)] if m != (-move[0], -move[1])]
-            for next_move in next_moves:
-                next_head_pos = [new_head[0] + next_move[0], new_head[1] + next_move[1]]
-                if is_safe(snake, next_head_pos, opponent):
+            for next_move in _MOVES_FROM[move]:
+                next_head_pos = (new_head[0] + next_move[0], new_head[1] + next_move[1])
+                if next_head_pos not in blocked:
                     mobility += 1
+            if food_score + mobility * 20 + max_bonus <= best_score:
+                continue
 
             # Advanced danger detection
             danger = 0
             if opponent and opponent.alive:
                 # Check if other snake is targeting same area
-                other_path = []
-                temp_head = opponent.get_head_position()
-                for _ in range(3):  # Predict next 3 moves
-                    temp_head = [temp_head[0] + opponent.direction[0], 
-                                temp_head[1] + opponent.direction[1]]
-                    other_path.append(temp_head)
                 if new_head in other_path:
                     danger += 2
 
-                # Space around other snake
-                other_space = 0
-                for m in [(1,0), (-1,0), (0,1), (0,-1)]:
-                    check_pos = [temp_head[0] + m[0], temp_head[1] + m[1]]
-                    if is_safe(opponent, check_pos, snake):
-                        other_space += 1
                 if other_space <= 1:  # Other snake in tight space
                     danger -= 1  # Less dangerous
 
@@ -194,30 +357,54 @@ class CustomBot(Bot):
         self.astar_bonus = 120.0
         self.trap_penalty = 350.0
         self.max_minimax_depth = 2
+        # Our replies kept at nodes with at least beam_min_depth plies left; the search is full width below
+        self.beam_width = 2
+        self.beam_min_depth = 3
         self.max_astar_nodes = 800
         self.max_bfs_nodes = 300
         self.time_budget = 0.04
         self.randomness = 0.02
+        # Take the A* step towards the nearest food whenever minimax finds it survivable,
+        # skipping the root search; subclasses with their own root search turn this off
+        self.follow_astar = True
+        # Processes to score root moves in; 0 searches them one after another in this process.
+        # Workers search with CustomBot's evaluation and these settings, from empty caches, so this
+        # only pays off with a time budget well above the default
+        self.root_workers = 0
+        self._tt = {}
+        self._dcache = {}
+        self._food_d2 = array('d', _FOOD_D2_UNSET)
+        self._leaf_memo = {}
+        self._root_grid = None
+        self._trap_d2 = None
+        self._astar_buckets, self._astar_g, self._astar_parent = {}, list(_ASTAR_G_UNSET), [0] * _CELLS
 
     def decide_move(self, snake: Snake, food: Food, opponent: Optional[Snake] = None, traps: Optional[Trap] = None) -> Tuple[int, int]:
         start_t = time.time()
+        self._reset_search_caches()
         head = snake.get_head_position()
         current_dir = snake.direction if snake.direction is not None else Direction.RIGHT
 
-        all_moves = [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]
-        possible_moves = [m for m in all_moves if m != Direction.opposite(current_dir)]
+        possible_moves = _MOVES_FROM[current_dir]
 
+        hx, hy = head
+        blocked = _blocked_cells(snake, opponent)
+        # Built once per decision and shared with every minimax call below
+        traps_set = {tuple(t) for t in traps.positions} if traps and traps.positions else set()
+        food_list = [tuple(f) for f in food.positions] if food and food.positions else []
+        # The real opponent's straight-line course is the same for every candidate move
+        opp_pred = self._predict_opponent_next_heads(opponent, steps=3) if opponent else []
         safe_moves = []
         for m in possible_moves:
-            nh = [head[0] + m[0], head[1] + m[1]]
-            if is_safe(snake, nh, opponent):
-                if traps and traps.positions and any(nh == [t[0], t[1]] for t in traps.positions):
+            nh = (hx + m[0], hy + m[1])
+            if nh not in blocked:
+                if nh in traps_set:
                     continue
                 safe_moves.append(m)
 
         if not safe_moves:
             for m in possible_moves:
-                nh = [head[0] + m[0], head[1] + m[1]]
+                nh = (hx + m[0], hy + m[1])
                 if 0 <= nh[0] < GRID_WIDTH and 0 <= nh[1] < GRID_HEIGHT:
                     safe_moves.append(m)
 
@@ -225,39 +412,42 @@ class CustomBot(Bot):
             return possible_moves[0] if possible_moves else Direction.RIGHT
 
         nearest_food = None
-        best_af_path = []
-        if food.positions:
-            foods_sorted = sorted(food.positions, key=lambda fpos: get_distance(head, fpos))[:6]
-            obstacles = set(tuple(s) for s in list(snake.segments)[1:])
+        best_step = None
+        if self.follow_astar and food.positions:
+            foods_sorted = heapq.nsmallest(6, food.positions, key=lambda p: (p[0] - hx) ** 2 + (p[1] - hy) ** 2)
+            # Flat obstacle grid, as used throughout the search
+            obstacles = bytearray(_BORDER_GRID)
+            for s in islice(snake.segments, 1, None):
+                obstacles[s[0] * _STRIDE + s[1]] = 1
             if opponent and opponent.alive:
-                obstacles.update(tuple(s) for s in list(opponent.segments))
-            if traps and traps.positions:
-                obstacles.update(tuple(t) for t in traps.positions)
+                for s in opponent.segments:
+                    obstacles[s[0] * _STRIDE + s[1]] = 1
+            for t in traps_set:
+                obstacles[t[0] * _STRIDE + t[1]] = 1
 
             best_len = None
             for fpos in foods_sorted:
-                path = self._astar(head, list(fpos), obstacles, self.max_astar_nodes)
-                if path:
-                    if best_len is None or len(path) < best_len:
-                        best_len = len(path)
-                        best_af_path = path
+                found = self._astar(head, fpos, obstacles, self.max_astar_nodes)
+                if found:
+                    if best_len is None or found[0] < best_len:
+                        best_len, best_step = found
                         nearest_food = fpos
 
-        if best_af_path and len(best_af_path) > 1:
-            next_pos = best_af_path[1]
-            move_to_follow = (next_pos[0] - head[0], next_pos[1] - head[1])
+        if best_step is not None:
+            move_to_follow = (best_step[0] - head[0], best_step[1] - head[1])
             if move_to_follow in safe_moves:
-                score = self._minimax_score(snake, opponent, food, traps, move_to_follow, self.max_minimax_depth, start_t)
+                score = self._minimax_score(snake, opponent, food, traps, move_to_follow, self.max_minimax_depth, start_t, traps_set, food_list, opp_pred)
                 if score > -1e6:
                     return move_to_follow
 
+        move_scores = self._move_scores(snake, opponent, food, traps, safe_moves, start_t, traps_set, food_list, opp_pred)
+
         best_move = None
         best_score = -float('inf')
         for move in safe_moves:
-            if time.time() - start_t > self.time_budget:
-                break
-            score = self._minimax_score(snake, opponent, food, traps, move, self.max_minimax_depth, start_t)
-            score += (random.random() * self.randomness)
+            if move not in move_scores:
+                continue
+            score = move_scores[move] + (random.random() * self.randomness)
             if score > best_score:
                 best_score = score
                 best_move = move
@@ -267,69 +457,120 @@ class CustomBot(Bot):
 
         return best_move
 
-    def _astar(self, start: List[int], target: List[int], obstacles: set, max_nodes: int = 800) -> List[List[int]]:
-        start_tup = tuple(start)
-        target_tup = tuple(target)
-        open_heap = []
-        gscore = {start_tup: 0}
-        fscore = {start_tup: get_distance(start, target)}
-        heapq.heappush(open_heap, (fscore[start_tup], start_tup, [list(start_tup)]))
-        closed = set()
+    def _move_scores(self, snake, opponent, food, traps, safe_moves, start_t, traps_set, food_list, opp_pred) -> dict:
+        """Score of each safe move searched inside the time budget; moves left out were not reached"""
+        if self.root_workers:
+            return self._parallel_move_scores(snake, opponent, safe_moves, start_t, traps_set, food_list, opp_pred)
+        return self._deepening_move_scores(snake, opponent, food, traps, safe_moves, start_t, traps_set, food_list, opp_pred)
+
+    def _deepening_move_scores(self, snake, opponent, food, traps, safe_moves, start_t, traps_set, food_list, opp_pred) -> dict:
+        # Iterative deepening: search the previous depth's best moves first and
+        # keep the last depth that finished inside the time budget
+        move_scores = {}
+        for d in range(1, self.max_minimax_depth + 1):
+            # Best-first by the previous depth's scores (a stable sort keeps ties in table order)
+            ordered = sorted(safe_moves, key=move_scores.__getitem__, reverse=True) if move_scores else safe_moves
+            scores = {}
+            for move in ordered:
+                if time.time() - start_t > self.time_budget:
+                    break
+                scores[move] = self._minimax_score(snake, opponent, food, traps, move, d, start_t, traps_set, food_list, opp_pred)
+            if len(scores) == len(safe_moves) or not move_scores:
+                move_scores = scores
+            if len(scores) < len(safe_moves):
+                break
+        return move_scores
+
+    def _parallel_move_scores(self, snake, opponent, safe_moves, start_t, traps_set, food_list, opp_pred) -> dict:
+        # Root parallelization: each safe move is searched to full depth in its own worker;
+        # moves whose search is not back inside the time budget are left unscored
+        pool = _root_pool(self.root_workers)
+        params = {name: getattr(self, name) for name in _SEARCH_PARAMS}
+        my_segments = tuple(snake.segments)
+        opp_segments = tuple(opponent.segments) if opponent and opponent.alive else ()
+        futures = {pool.submit(_score_move_worker, params, my_segments, snake.shield_timer, opp_segments, m,
+                               self.max_minimax_depth, start_t, traps_set, food_list, opp_pred): m for m in safe_moves}
+        done, not_done = wait(futures, timeout=max(0.0, start_t + self.time_budget - time.time()))
+        # Drop late moves that haven't started so they don't queue ahead of the next decision
+        for f in not_done:
+            f.cancel()
+        return {futures[f]: f.result() for f in done if f.exception() is None}
+
+    def _astar(self, start: Tuple[int, int], target: Tuple[int, int], obstacles: bytearray, max_nodes: int = 800) -> Optional[Tuple[int, Optional[Tuple[int, int]]]]:
+        """Shortest path as (cells on it including start, first step or None if already there), or None"""
+        # Nodes are flat cell indices. With unit steps and a Manhattan heuristic every f-score
+        # is a small integer that never drops below the one being expanded, so a bucket per f
+        # (popped newest-first, favouring deeper nodes on ties) replaces a heap
+        sx, sy = start[0], start[1]
+        tx, ty = target[0], target[1]
+        start_i = sx * _STRIDE + sy
+        target_i = tx * _STRIDE + ty
+        f = abs(sx - tx) + abs(sy - ty)
+        # Search containers live on the bot: per-cell cost and parent arrays, reset by one slice copy
+        # (a parent is only read for cells whose cost was set this call)
+        buckets, gscore, came_from = self._astar_buckets, self._astar_g, self._astar_parent
+        buckets.clear()
+        gscore[:] = _ASTAR_G_UNSET
+        buckets[f] = [start_i]
+        open_count = 1
+        gscore[start_i] = 0
+        closed = bytearray(_CELLS)
         nodes = 0
 
-        while open_heap and nodes < max_nodes:
-            nodes += 1
-            _, current, path = heapq.heappop(open_heap)
-            if current == target_tup:
-                return path
-            if current in closed:
+        while open_count and nodes < max_nodes:
+            bucket = buckets.get(f)
+            if not bucket:
+                f += 1
                 continue
-            closed.add(current)
-            cx, cy = current
-            for move in [(1,0),(-1,0),(0,1),(0,-1)]:
-                nx, ny = cx + move[0], cy + move[1]
-                nt = (nx, ny)
-                if not (0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT):
-                    continue
-                if nt in obstacles:
-                    continue
-                tentative_g = gscore[current] + 1
-                if nt not in gscore or tentative_g < gscore[nt]:
-                    gscore[nt] = tentative_g
-                    h = get_distance((nx, ny), target)
-                    heapq.heappush(open_heap, (tentative_g + h, nt, path + [[nx, ny]]))
-        return []
-
-    def _flood_fill_area(self, head_pos: List[int], my_segments: List[List[int]], other_segments: List[List[int]], max_nodes: int = 300) -> int:
-        visited = set()
-        q = deque()
-        start = tuple(head_pos)
-        visited.add(start)
-        q.append(start)
-        obstacles = set(tuple(s) for s in my_segments) | set(tuple(s) for s in other_segments)
-        count = 0
-        nodes = 0
-        while q and nodes < max_nodes:
+            current = bucket.pop()
+            open_count -= 1
             nodes += 1
-            pos = q.popleft()
-            count += 1
-            x, y = pos
-            for dx, dy in [(1,0),(-1,0),(0,1),(0,-1)]:
-                nx, ny = x + dx, y + dy
-                if not (0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT):
-                    continue
-                nt = (nx, ny)
-                if nt in visited or nt in obstacles:
+            if current == target_i:
+                # Callers only need the length and the first step, so walk back without building the path
+                if current == start_i:
+                    return 1, None
+                while came_from[current] != start_i:
+                    current = came_from[current]
+                return gscore[target_i] + 1, _CELL_XY[current]
+            if closed[current]:
+                continue
+            closed[current] = 1
+            cx, cy = _CELL_XY[current]
+            tentative_g = gscore[current] + 1
+            for (dx, dy), step in _STEPS:
+                ni = current + step
+                if obstacles[ni]:
                     continue
-                visited.add(nt)
-                q.append(nt)
-        return count
+                if tentative_g < gscore[ni]:
+                    gscore[ni] = tentative_g
+                    came_from[ni] = current
+                    nf = tentative_g + abs(cx + dx - tx) + abs(cy + dy - ty)
+                    if nf in buckets:
+                        buckets[nf].append(ni)
+                    else:
+                        buckets[nf] = [ni]
+                    open_count += 1
+        return None
+
+    def _flood_fill_area(self, head_pos: Tuple[int, int], free: int, max_nodes: int = 300) -> int:
+        # Grow the reachable region one BFS layer at a time with shifts over the free-cell bitboard
+        # (border cells are never free, so no shift can wrap), removing each layer from the cells
+        # still available and counting it as it is added
+        frontier = 1 << (head_pos[0] * _STRIDE + head_pos[1])
+        avail = free & ~frontier
+        count = 1
+        while frontier and count < max_nodes:
+            frontier = ((frontier << 1) | (frontier >> 1)
+                        | (frontier << _STRIDE) | (frontier >> _STRIDE)) & avail
+            avail ^= frontier
+            count += frontier.bit_count()
+        return min(count, max_nodes)
 
     def _predict_opponent_next_heads(self, opponent: Optional[Snake], steps: int = 3) -> List[List[int]]:
         path = []
         if not opponent or not opponent.alive:
             return path
-        pos = opponent.get_head_position()[:]
+        pos = opponent.get_head_position()
         dir_ = opponent.direction
         for _ in range(steps):
             nxt = [pos[0] + dir_[0], pos[1] + dir_[1]]
@@ -339,447 +580,420 @@ class CustomBot(Bot):
             pos = nxt
         return path
 
-    def _simulate_step(self, snake_head: List[int], snake_body: List[List[int]], move: Tuple[int,int]) -> (List[int], List[List[int]]):
-        new_head = [snake_head[0] + move[0], snake_head[1] + move[1]]
-        new_body = [new_head] + snake_body[:-1] if len(snake_body) > 0 else [new_head]
-        return new_head, new_body
-
-    def _available_moves_from(self, head: List[int], body: List[List[int]], other_body: List[List[int]]) -> List[Tuple[int,int]]:
-        moves = []
-        for m in [(1,0),(-1,0),(0,1),(0,-1)]:
-            nh = [head[0] + m[0], head[1] + m[1]]
-            if not (0 <= nh[0] < GRID_WIDTH and 0 <= nh[1] < GRID_HEIGHT):
-                continue
-            if nh in body[1:]:
-                continue
-            if nh in other_body:
-                continue
-            moves.append(m)
-        return moves
-
-    def _minimax_score(self, snake: Snake, opponent: Optional[Snake], food: Food, traps: Optional[Trap], first_move: Tuple[int,int], depth: int = 3, start_time: float = 0.0) -> float:
-        my_head = snake.get_head_position()[:]
-        my_body = [seg[:] for seg in snake.segments]
-        opp_head = opponent.get_head_position()[:] if opponent and opponent.alive else None
-        opp_body = [seg[:] for seg in opponent.segments] if opponent and opponent.alive else []
-
-        traps_set = set(tuple(t) for t in (traps.positions if traps and traps.positions else []))
-        food_list = [tuple(f) for f in food.positions] if food and food.positions else []
-
-        my_head, my_body = self._simulate_step(my_head, my_body, first_move)
+    def _reset_search_caches(self) -> None:
+        """Cached search values depend on this tick's food and traps"""
+        self._tt.clear()
+        self._dcache.clear()
+        self._leaf_memo.clear()
+        self._root_grid = None
+        self._trap_d2 = None
+        self._food_d2[:] = _FOOD_D2_UNSET
+
+    def _available_moves_from(self, head: Tuple[int, int], occ: bytearray) -> List[Tuple[int,int]]:
+        # occ marks the border as occupied, so one lookup covers walls and bodies
+        i = head[0] * _STRIDE + head[1]
+        return [m for m, step in _STEPS if not occ[i + step]]
+
+    def _minimax_score(self, snake: Snake, opponent: Optional[Snake], food: Food, traps: Optional[Trap], first_move: Tuple[int,int], depth: int = 3, start_time: float = 0.0,
+                       traps_set: Optional[set] = None, food_list: Optional[List[Tuple[int, int]]] = None,
+                       opp_pred: Optional[List[List[int]]] = None) -> float:
+        # Bodies are deques of (x, y) tuples the search advances in place and restores on the way back
+        my_body = deque(snake.segments)
+        my_head = my_body[0]
+        opp_body = deque(opponent.segments) if opponent and opponent.alive else deque()
+        opp_head = opp_body[0] if opp_body else None
+
+        if traps_set is None:
+            traps_set = {tuple(t) for t in traps.positions} if traps and traps.positions else set()
+        if food_list is None:
+            food_list = [tuple(f) for f in food.positions] if food and food.positions else []
+
+        # Grid, bitboard and hash of the position before the first move are shared by every root move
+        if self._root_grid is None:
+            self._root_grid = _position_grid(my_body, opp_body)
+        root_occ, root_free, root_hash = self._root_grid
+        old_head_i = my_head[0] * _STRIDE + my_head[1]
+
+        my_head = (my_head[0] + first_move[0], my_head[1] + first_move[1])
+        tail = my_body.pop()
+        my_body.appendleft(my_head)
 
         if not (0 <= my_head[0] < GRID_WIDTH and 0 <= my_head[1] < GRID_HEIGHT):
             return -1e9
-        if tuple(my_head) in set(tuple(s) for s in my_body[1:]):
+        if my_head in islice(my_body, 1, None):
             return -1e9
-        if opp_body and tuple(my_head) in set(tuple(s) for s in opp_body):
+        if my_head in opp_body:
             return -1e9
         if tuple(my_head) in traps_set and snake.shield_timer <= 0:
             return -1e7
 
-        def heuristic(my_h, my_b, opp_h, opp_b):
-            food_dist = min((get_distance(my_h, f) for f in food_list), default=float('inf'))
-            food_score = self.food_weight / (food_dist + 1.0)
-
-            my_area = self._flood_fill_area(my_h, my_b, opp_b, self.max_bfs_nodes)
-            opp_area = self._flood_fill_area(opp_h, opp_b, my_b, self.max_bfs_nodes) if opp_h else 0
-            area_score = self.area_weight * (my_area - opp_area)
-
-            trap_dist = min((get_distance(my_h, t) for t in traps_set), default=float('inf')) if traps_set else float('inf')
-            trap_score = -self.trap_penalty / (trap_dist + 1.0) if trap_dist < 4 else 0
-
-            len_diff = len(my_b) - (len(opp_b) if opp_b else 0)
-            length_score = self.length_weight * math.tanh(len_diff / 3.0)
-
+        # Flat occupancy grid counting the body
+        # segments on each cell; the search updates it in place as snakes move
+        # and hands the matching bitboard of empty cells down each move for the fills.
+        # The Zobrist hash of both snakes is updated incrementally alongside occ
+        head_i = my_head[0] * _STRIDE + my_head[1]
+        tail_i = tail[0] * _STRIDE + tail[1]
+        occ = root_occ[:]
+        occ[head_i] += 1
+        occ[tail_i] -= 1
+        free = root_free & ~(1 << head_i)
+        if not occ[tail_i]:
+            free |= 1 << tail_i
+        root_hash ^= (_ZOBRIST[old_head_i][1] ^ _ZOBRIST[head_i][1]
+                      ^ _ZOBRIST[head_i][0] ^ _ZOBRIST[tail_i][0])
+        tt = self._tt
+        if len(tt) > _TT_MAX_ENTRIES:
+            tt.clear()
+
+        # Leaf terms that cannot change inside the search: simulated snakes never
+        # grow, and the danger term only looks at the real opponent's heading
+        len_diff = len(my_body) - len(opp_body)
+        length_score = self.length_weight * math.tanh(len_diff / 3.0)
+        if opp_pred is None:
+            opp_pred = self._predict_opponent_next_heads(opponent, steps=3) if opponent else []
+        opp_longer = bool(opp_body) and len(opp_body) >= len(my_body)
+
+        dcache, food_d2 = self._dcache, self._food_d2
+        trap_cells = [t[0] * _STRIDE + t[1] for t in traps_set]
+        leaf_memo = self._leaf_memo
+        if self._trap_d2 is None:
+            self._trap_d2 = _trap_d2_grid(traps_set)
+        trap_d2_grid = self._trap_d2
+
+        def nearest_food_d2(x, y):
+            cell = x * _STRIDE + y
+            d = food_d2[cell]
+            if d < 0:
+                d = food_d2[cell] = min(((x - fx) ** 2 + (y - fy) ** 2 for fx, fy in food_list), default=float('inf'))
+            return d
+
+        # Method and global lookups hoisted into closure locals for the hot search loops
+        available_moves, flood_fill, astar = self._available_moves_from, self._flood_fill_area, self._astar
+        zobrist, now = _ZOBRIST, time.time
+        # Weights are fixed for the whole search; bind them once rather than per leaf
+        food_weight, trap_penalty, area_weight = self.food_weight, self.trap_penalty, self.area_weight
+        astar_weight, danger_weight = self.astar_bonus, self.danger_weight
+        max_bfs_nodes, beam_width, beam_min_depth = self.max_bfs_nodes, self.beam_width, self.beam_min_depth
+        deadline = start_time + self.time_budget
+
+        def heuristic(my_h, my_b, opp_h, opp_b, h, free, alpha, beta):
+            # A leaf's value depends only on the position, which the Zobrist hash identifies;
+            # the same leaf recurs across root moves and deepening iterations
+            total = leaf_memo.get(h)
+            if total is not None:
+                return total
+            hx, hy = my_h[0], my_h[1]
+            # Food, trap and opponent-course terms only depend on the head cell, which many leaves share
+            cell = hx * _STRIDE + hy
+            cached = dcache.get(cell)
+            if cached is None:
+                food_dist = math.sqrt(nearest_food_d2(hx, hy))
+                trap_d2 = trap_d2_grid[cell]
+                min_opp_d2 = min((_d2(my_h, p) for p in opp_pred), default=float('inf'))
+                danger_score = 0.0
+                if min_opp_d2 < 4:
+                    min_opp_dist = math.sqrt(min_opp_d2)
+                    if opp_longer:
+                        danger_score = -danger_weight * (2.0 - min_opp_dist)
+                    else:
+                        danger_score = -danger_weight * 0.4 * (2.0 - min_opp_dist)
+                cached = dcache[cell] = (
+                    food_weight / (food_dist + 1.0),
+                    -trap_penalty / (math.sqrt(trap_d2) + 1.0) if trap_d2 < 16 else 0,
+                    danger_score,
+                )
+            food_score, trap_score, danger_score = cached
+
+            my_area = flood_fill(my_h, free, max_bfs_nodes)
+            opp_area = flood_fill(opp_h, free, max_bfs_nodes) if opp_h else 0
+            area_score = area_weight * (my_area - opp_area)
+
+            # The path bonus lies in [0, astar_weight]; when neither end can bring the value
+            # inside (alpha, beta), return that bound (left uncached) and skip the path search
+            partial = food_score + area_score
+            best_case = partial + astar_weight + length_score + trap_score + danger_score
+            if best_case <= alpha:
+                return best_case
+            worst_case = partial + 0.0 + length_score + trap_score + danger_score
+            if worst_case >= beta:
+                return worst_case
             astar_bonus = 0.0
             if food_list:
-                try_targets = sorted(food_list, key=lambda p: get_distance(my_h, p))[:2]
+                try_targets = _two_nearest(my_h, food_list)
+                path_grid = occ[:]
+                for c in trap_cells:
+                    path_grid[c] = 1
                 for t in try_targets:
-                    path = self._astar(my_h, list(t), set(tuple(s) for s in my_b) | set(tuple(s) for s in opp_b) | traps_set, max_nodes=120)
-                    if path:
-                        astar_bonus = self.astar_bonus / (len(path))
+                    found = astar(my_h, t, path_grid, max_nodes=120)
+                    if found:
+                        astar_bonus = astar_weight / found[0]
                         break
 
-            opp_pred = self._predict_opponent_next_heads(opponent, steps=3) if opponent else []
-            min_opp_dist = min((get_distance(my_h, p) for p in opp_pred), default=float('inf'))
-            danger_score = 0.0
-            if min_opp_dist < 2:
-                if opp_b and len(opp_b) >= len(my_b):
-                    danger_score = -self.danger_weight * (2.0 - min_opp_dist)
-                else:
-                    danger_score = -self.danger_weight * 0.4 * (2.0 - min_opp_dist)
-
             total = food_score + area_score + astar_bonus + length_score + trap_score + danger_score
+            leaf_memo[h] = total
             return total
 
-        def predict_opponent_moves(opp_h, opp_b, my_b):
-            moves = self._available_moves_from(opp_h, opp_b, my_b)
+        def predict_opponent_moves(opp_h):
+            moves = available_moves(opp_h, occ)
             if not moves:
-                return [ (0,0) ]
+                return [_STAY]
             scored = []
             for mv in moves:
-                nxt = (opp_h[0] + mv[0], opp_h[1] + mv[1])
-                dfood = min((get_distance(nxt, f) for f in food_list), default=float('inf'))
+                dfood = nearest_food_d2(opp_h[0] + mv[0], opp_h[1] + mv[1])
                 scored.append( (dfood, mv) )
-            scored.sort(key=lambda x: x[0])
+            scored.sort(key=itemgetter(0))
             return [m for _,m in scored[:3]]
 
-        def minimax(my_h, my_b, opp_h, opp_b, depth, alpha, beta, maximizing_player):
-            if time.time() - start_time > self.time_budget:
-                return heuristic(my_h, my_b, opp_h, opp_b)
-            if depth == 0:
-                return heuristic(my_h, my_b, opp_h, opp_b)
+        def minimax(my_h, my_b, opp_h, opp_b, depth, alpha, beta, maximizing_player, h, free):
+            # Leaves are most of the calls and return the heuristic either way, so they skip the clock
+            if depth == 0 or now() > deadline:
+                return heuristic(my_h, my_b, opp_h, opp_b, h, free, alpha, beta)
+
+            # One entry per position and side to move; a result searched at least
+            # this deep answers the probe, and any entry's best reply is tried first
+            tt_key = (h, maximizing_player)
+            entry = tt.get(tt_key)
+            pv_move = None
+            if entry is not None:
+                flag, cached, pv_move, cached_depth = entry
+                if cached_depth >= depth and (flag == _TT_EXACT or (flag == _TT_LOWER and cached >= beta)
+                                              or (flag == _TT_UPPER and cached <= alpha)):
+                    return cached
+            alpha_orig, beta_orig = alpha, beta
+            best = None
 
             if maximizing_player:
                 val = -float('inf')
-                moves = self._available_moves_from(my_h, my_b, opp_b)
+                moves = available_moves(my_h, occ)
                 if not moves:
                     return -1e6
+                # Static ordering: moves that close in on food first, behind the previous best reply
+                if len(moves) > 1:
+                    moves.sort(key=lambda m: nearest_food_d2(my_h[0] + m[0], my_h[1] + m[1]))
+                if pv_move in moves:
+                    moves.remove(pv_move)
+                    moves.insert(0, pv_move)
+                # Beam: far from the leaves, only the best-ordered replies are searched
+                if depth >= beam_min_depth:
+                    del moves[beam_width:]
+                tail_i = my_b[-1][0] * _STRIDE + my_b[-1][1]
+                old_head_key = zobrist[my_h[0] * _STRIDE + my_h[1]][1]
                 for mv in moves:
-                    nxt_h, nxt_b = self._simulate_step(my_h, my_b, mv)
-                    if not (0 <= nxt_h[0] < GRID_WIDTH and 0 <= nxt_h[1] < GRID_HEIGHT):
-                        continue
-                    if tuple(nxt_h) in set(tuple(s) for s in nxt_b[1:]):
-                        continue
-                    if opp_b and tuple(nxt_h) in set(tuple(s) for s in opp_b):
-                        continue
-                    v = minimax(nxt_h, nxt_b, opp_h, opp_b, depth-1, alpha, beta, False)
-                    val = max(val, v)
+                    nxt_h = (my_h[0] + mv[0], my_h[1] + mv[1])
+                    head_i = nxt_h[0] * _STRIDE + nxt_h[1]
+                    nxt_hash = (h ^ old_head_key ^ zobrist[head_i][1]
+                                ^ zobrist[head_i][0] ^ zobrist[tail_i][0])
+                    tail = my_b.pop()
+                    my_b.appendleft(nxt_h)
+                    occ[head_i] += 1
+                    occ[tail_i] -= 1
+                    nxt_free = free & ~(1 << head_i)
+                    if not occ[tail_i]:
+                        nxt_free |= 1 << tail_i
+                    v = minimax(nxt_h, my_b, opp_h, opp_b, depth-1, alpha, beta, False, nxt_hash, nxt_free)
+                    occ[tail_i] += 1
+                    occ[head_i] -= 1
+                    my_b.popleft()
+                    my_b.append(tail)
+                    if v > val:
+                        val = v
+                        best = mv
                     alpha = max(alpha, val)
                     if alpha >= beta:
                         break
-                return val
             else:
                 val = float('inf')
                 if not opp_h:
-                    return heuristic(my_h, my_b, opp_h, opp_b)
-                moves = predict_opponent_moves(opp_h, opp_b, my_b)
+                    return heuristic(my_h, my_b, opp_h, opp_b, h, free, alpha, beta)
+                moves = predict_opponent_moves(opp_h)
                 if not moves:
-                    return heuristic(my_h, my_b, opp_h, opp_b)
+                    return heuristic(my_h, my_b, opp_h, opp_b, h, free, alpha, beta)
+                if pv_move in moves:
+                    moves.remove(pv_move)
+                    moves.insert(0, pv_move)
+                tail_i = opp_b[-1][0] * _STRIDE + opp_b[-1][1]
+                old_head_key = zobrist[opp_h[0] * _STRIDE + opp_h[1]][3]
                 for mv in moves:
-                    nxt_opp_h, nxt_opp_b = self._simulate_step(opp_h, opp_b, mv)
-                    if not (0 <= nxt_opp_h[0] < GRID_WIDTH and 0 <= nxt_opp_h[1] < GRID_HEIGHT):
-                        continue
-                    if tuple(nxt_opp_h) in set(tuple(s) for s in nxt_opp_b[1:]):
+                    nxt_opp_h = (opp_h[0] + mv[0], opp_h[1] + mv[1])
+                    # Free cells come from the grid, so only a boxed-in opponent staying put can collide
+                    if mv is _STAY and len(opp_b) > 1:
                         continue
-                    if tuple(nxt_opp_h) in set(tuple(s) for s in my_b):
+                    if mv is _STAY and nxt_opp_h in my_b:
                         v = -1e5
                     else:
-                        v = minimax(my_h, my_b, nxt_opp_h, nxt_opp_b, depth-1, alpha, beta, True)
-                    val = min(val, v)
+                        head_i = nxt_opp_h[0] * _STRIDE + nxt_opp_h[1]
+                        nxt_hash = (h ^ old_head_key ^ zobrist[head_i][3]
+                                    ^ zobrist[head_i][2] ^ zobrist[tail_i][2])
+                        tail = opp_b.pop()
+                        opp_b.appendleft(nxt_opp_h)
+                        occ[head_i] += 1
+                        occ[tail_i] -= 1
+                        nxt_free = free & ~(1 << head_i)
+                        if not occ[tail_i]:
+                            nxt_free |= 1 << tail_i
+                        v = minimax(my_h, my_b, nxt_opp_h, opp_b, depth-1, alpha, beta, True, nxt_hash, nxt_free)
+                        occ[tail_i] += 1
+                        occ[head_i] -= 1
+                        opp_b.popleft()
+                        opp_b.append(tail)
+                    if v < val:
+                        val = v
+                        best = mv
                     beta = min(beta, val)
                     if alpha >= beta:
                         break
-                return val
+
+            if val <= alpha_orig:
+                flag = _TT_UPPER
+            elif val >= beta_orig:
+                flag = _TT_LOWER
+            else:
+                flag = _TT_EXACT
+            # Depth-preferred replacement: keep a deeper result over this one
+            if entry is None or entry[3] <= depth:
+                tt[tt_key] = (flag, val, best, depth)
+            return val
 
         try:
-            score = minimax(my_head, my_body, opp_head, opp_body, depth, -float('inf'), float('inf'), True)
+            score = minimax(my_head, my_body, opp_head, opp_body, depth, -float('inf'), float('inf'), True, root_hash, free)
         except Exception:
             score = -1e6
         return score
 
-    def get_possible_moves(self, snake: Snake) -> List[Tuple[int,int]]:
-        cur = snake.direction if snake.direction is not None else Direction.RIGHT
-        candidates = [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]
-        return [m for m in candidates if m != Direction.opposite(cur)]
+    def get_possible_moves(self, snake: Snake) -> Tuple[Tuple[int,int], ...]:
+        return _MOVES_FROM[snake.direction or Direction.RIGHT]
 
 
-class UserBot(Bot):
-    def __init__(self, name: str = "ChampionBot"):
-        super().__init__(name=name)
-        self.food_weight = 200.0
-        self.area_weight = 6.0
-        self.danger_weight = 220.0
-        self.length_weight = 40.0
-        self.astar_bonus = 120.0
-        self.trap_penalty = 350.0
-        self.max_minimax_depth = 2         
-        self.max_astar_nodes = 800
-        self.max_bfs_nodes = 300
-        self.time_budget = 0.04        
-        self.randomness = 0.02            
-
-    def decide_move(self, snake: Snake, food: Food, opponent: Optional[Snake] = None, traps: Optional[Trap] = None) -> Tuple[int, int]:
-
-        start_t = time.time()
-        head = snake.get_head_position()
-        current_dir = snake.direction if snake.direction is not None else Direction.RIGHT
-
-        all_moves = [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]
-        possible_moves = [m for m in all_moves if m != Direction.opposite(current_dir)]
+class _MCTSNode:
+    """MCTSBot tree node for one of our moves; the opponent's replies are left to chance"""
+    __slots__ = ("visits", "value", "children", "untried_moves")
 
-        safe_moves = []
-        for m in possible_moves:
-            nh = [head[0] + m[0], head[1] + m[1]]
-            if is_safe(snake, nh, opponent):
-                if traps and traps.positions and any(nh == [t[0], t[1]] for t in traps.positions):
-                    continue
-                safe_moves.append(m)
-
-        if not safe_moves:
-            for m in possible_moves:
-                nh = [head[0] + m[0], head[1] + m[1]]
-                if 0 <= nh[0] < GRID_WIDTH and 0 <= nh[1] < GRID_HEIGHT:
-                    safe_moves.append(m)
-
-        if not safe_moves:
-            return possible_moves[0] if possible_moves else Direction.RIGHT
+    def __init__(self, untried_moves: List[Tuple[int, int]]):
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}
+        self.untried_moves = untried_moves
 
-        nearest_food = None
-        best_af_path = []
-        if food.positions:
-            foods_sorted = sorted(food.positions, key=lambda fpos: get_distance(head, fpos))[:6]
-            obstacles = set(tuple(s) for s in list(snake.segments)[1:])
-            if opponent and opponent.alive:
-                obstacles.update(tuple(s) for s in list(opponent.segments))
-            if traps and traps.positions:
-                obstacles.update(tuple(t) for t in traps.positions)
-
-            best_len = None
-            for fpos in foods_sorted:
-                path = self._astar(head, list(fpos), obstacles, max_nodes=self.max_astar_nodes)
-                if path:
-                    if best_len is None or len(path) < best_len:
-                        best_len = len(path)
-                        best_af_path = path
-                        nearest_food = fpos
-
-        if best_af_path and len(best_af_path) > 1:
-            next_pos = best_af_path[1]
-            move_to_follow = (next_pos[0] - head[0], next_pos[1] - head[1])
-            if move_to_follow in safe_moves:
-                score = self._minimax_score(snake, opponent, food, traps, move_to_follow, depth=2, start_time=start_t)
-                if score > -1e6:
-                    return move_to_follow
-
-        best_move = None
-        best_score = -float('inf')
-        for move in safe_moves:
-            if time.time() - start_t > self.time_budget:
-                break
-            score = self._minimax_score(snake, opponent, food, traps, move, depth=self.max_minimax_depth, start_time=start_t)
-            score += (random.random() * self.randomness)
-            if score > best_score:
-                best_score = score
-                best_move = move
-
-        if best_move is None:
-            best_move = random.choice(safe_moves)
-
-        return best_move
 
-    def _astar(self, start: List[int], target: List[int], obstacles: set, max_nodes: int = 800) -> List[List[int]]:
-        start_tup = tuple(start)
-        target_tup = tuple(target)
-        open_heap = []
-        gscore = {start_tup: 0}
-        fscore = {start_tup: get_distance(start, target)}
-        heapq.heappush(open_heap, (fscore[start_tup], start_tup, [list(start_tup)]))
-        closed = set()
-        nodes = 0
-
-        while open_heap and nodes < max_nodes:
-            nodes += 1
-            _, current, path = heapq.heappop(open_heap)
-            if current == target_tup:
-                return path
-            if current in closed:
-                continue
-            closed.add(current)
-            cx, cy = current
-            for move in [(1,0),(-1,0),(0,1),(0,-1)]:
-                nx, ny = cx + move[0], cy + move[1]
-                nt = (nx, ny)
-                if not (0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT):
-                    continue
-                if nt in obstacles:
-                    continue
-                tentative_g = gscore[current] + 1
-                if nt not in gscore or tentative_g < gscore[nt]:
-                    gscore[nt] = tentative_g
-                    h = get_distance((nx, ny), target)
-                    heapq.heappush(open_heap, (tentative_g + h, nt, path + [[nx, ny]]))
-        return []
-
-    def _flood_fill_area(self, head_pos: List[int], my_segments: List[List[int]], other_segments: List[List[int]], max_nodes: int = 300) -> int:
-        visited = set()
-        q = deque()
-        start = tuple(head_pos)
-        visited.add(start)
-        q.append(start)
-        obstacles = set(tuple(s) for s in my_segments) | set(tuple(s) for s in other_segments)
-        count = 0
-        nodes = 0
-        while q and nodes < max_nodes:
-            nodes += 1
-            pos = q.popleft()
-            count += 1
-            x, y = pos
-            for dx, dy in [(1,0),(-1,0),(0,1),(0,-1)]:
-                nx, ny = x + dx, y + dy
-                if not (0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT):
-                    continue
-                nt = (nx, ny)
-                if nt in visited or nt in obstacles:
-                    continue
-                visited.add(nt)
-                q.append(nt)
-        return count
-
-    def _predict_opponent_next_heads(self, opponent: Optional[Snake], steps: int = 3) -> List[List[int]]:
-        path = []
-        if not opponent or not opponent.alive:
-            return path
-        pos = opponent.get_head_position()[:]
-        dir_ = opponent.direction
-        for _ in range(steps):
-            nxt = [pos[0] + dir_[0], pos[1] + dir_[1]]
-            if not (0 <= nxt[0] < GRID_WIDTH and 0 <= nxt[1] < GRID_HEIGHT):
-                break
-            path.append(nxt)
-            pos = nxt
-        return path
-
-    def _simulate_step(self, snake_head: List[int], snake_body: List[List[int]], move: Tuple[int,int]) -> (List[int], List[List[int]]):
-        new_head = [snake_head[0] + move[0], snake_head[1] + move[1]]
-        new_body = [new_head] + snake_body[:-1] if len(snake_body) > 0 else [new_head]
-        return new_head, new_body
-
-    def _available_moves_from(self, head: List[int], body: List[List[int]], other_body: List[List[int]]) -> List[Tuple[int,int]]:
-        moves = []
-        for m in [(1,0),(-1,0),(0,1),(0,-1)]:
-            nh = [head[0] + m[0], head[1] + m[1]]
-            if not (0 <= nh[0] < GRID_WIDTH and 0 <= nh[1] < GRID_HEIGHT):
-                continue
-            if nh in body[1:]:
-                continue
-            if nh in other_body:
-                continue
-            moves.append(m)
-        return moves
-
-    def _minimax_score(self, snake: Snake, opponent: Optional[Snake], food: Food, traps: Optional[Trap], first_move: Tuple[int,int], depth: int = 3, start_time: float = 0.0) -> float:
-        my_head = snake.get_head_position()[:]
-        my_body = [seg[:] for seg in snake.segments]
-        opp_head = opponent.get_head_position()[:] if opponent and opponent.alive else None
-        opp_body = [seg[:] for seg in opponent.segments] if opponent and opponent.alive else []
-
-        traps_set = set(tuple(t) for t in (traps.positions if traps and traps.positions else []))
-        food_list = [tuple(f) for f in food.positions] if food and food.positions else []
-
-        my_head, my_body = self._simulate_step(my_head, my_body, first_move)
-
-        if not (0 <= my_head[0] < GRID_WIDTH and 0 <= my_head[1] < GRID_HEIGHT):
-            return -1e9
-        if tuple(my_head) in set(tuple(s) for s in my_body[1:]):
-            return -1e9
-        if opp_body and tuple(my_head) in set(tuple(s) for s in opp_body):
-            return -1e9
-        if tuple(my_head) in traps_set and snake.shield_timer <= 0:
-            return -1e7
-
-        def heuristic(my_h, my_b, opp_h, opp_b):
-            food_dist = min((get_distance(my_h, f) for f in food_list), default=float('inf'))
-            food_score = self.food_weight / (food_dist + 1.0)
-
-            my_area = self._flood_fill_area(my_h, my_b, opp_b, self.max_bfs_nodes)
-            opp_area = self._flood_fill_area(opp_h, opp_b, my_b, self.max_bfs_nodes) if opp_h else 0
-            area_score = self.area_weight * (my_area - opp_area)
-
-            trap_dist = min((get_distance(my_h, t) for t in traps_set), default=float('inf')) if traps_set else float('inf')
-            trap_score = -self.trap_penalty / (trap_dist + 1.0) if trap_dist < 4 else 0
-
-            len_diff = len(my_b) - (len(opp_b) if opp_b else 0)
-            length_score = self.length_weight * math.tanh(len_diff / 3.0)
-
-            astar_bonus = 0.0
-            if food_list:
-                try_targets = sorted(food_list, key=lambda p: get_distance(my_h, p))[:2]
-                for t in try_targets:
-                    path = self._astar(my_h, list(t), set(tuple(s) for s in my_b) | set(tuple(s) for s in opp_b) | traps_set, max_nodes=120)
-                    if path:
-                        astar_bonus = self.astar_bonus / (len(path))
+class MCTSBot(CustomBot):
+    """CustomBot with its root moves scored by a UCB1 Monte-Carlo tree search instead of minimax"""
+    def __init__(self):
+        super().__init__()
+        self.name = "MCTSBot"
+        # Every move comes from the tree search, not CustomBot's A* shortcut
+        self.follow_astar = False
+        self.exploration = 60.0
+        self.playout_moves = 15
+        # Value of a rollout that dies; kept near the heuristic's range so one bad
+        # random playout does not bury a move for the rest of the search
+        self.death_score = -1000.0
+        # Added to a rollout's value for each food cell it passes over, scaled by food_discount per
+        # step taken first, so apples reached on the way count and sooner beats later
+        self.food_reward = 200.0
+        self.food_discount = 0.8
+
+    def _move_scores(self, snake, opponent, food, traps, safe_moves, start_t, traps_set, food_list, opp_pred) -> dict:
+        my_root = list(snake.segments)
+        opp_root = list(opponent.segments) if opponent and opponent.alive else []
+        root_occ = _position_grid(my_root, opp_root)[0]
+        root = _MCTSNode(list(safe_moves))
+        c = self.exploration
+        food_set = set(food_list)
+        food_reward, discount = self.food_reward, self.food_discount
+
+        def ucb(item):
+            child = item[1]
+            return child.value / child.visits + c * math.sqrt(log_n / child.visits)
+
+        while time.time() - start_t <= self.time_budget:
+            occ = root_occ[:]
+            my_b, opp_b = deque(my_root), deque(opp_root)
+            node = root
+            path = [root]
+            alive = True
+            eaten = set()
+            reward, scale = 0.0, 1.0
+
+            # Selection: follow UCB1 through fully expanded nodes
+            while alive and not node.untried_moves and node.children:
+                log_n = math.log(node.visits)
+                mv, node = max(node.children.items(), key=ucb)
+                path.append(node)
+                alive = self._playout_step(my_b, opp_b, occ, mv)
+                scale *= discount
+                if my_b[0] in food_set and my_b[0] not in eaten:
+                    eaten.add(my_b[0])
+                    reward += food_reward * scale
+
+            # Expansion: one random untried move
+            if alive and node.untried_moves:
+                mv = node.untried_moves.pop(random.randrange(len(node.untried_moves)))
+                alive = self._playout_step(my_b, opp_b, occ, mv)
+                scale *= discount
+                if my_b[0] in food_set and my_b[0] not in eaten:
+                    eaten.add(my_b[0])
+                    reward += food_reward * scale
+                child = node.children[mv] = _MCTSNode(self._available_moves_from(my_b[0], occ) if alive else [])
+                path.append(child)
+
+            # Playout: random moves, with the last one scored by the minimax leaf heuristic
+            value = self.death_score
+            if alive:
+                for _ in range(self.playout_moves - 1):
+                    moves = self._available_moves_from(my_b[0], occ)
+                    if not moves or not self._playout_step(my_b, opp_b, occ, random.choice(moves)):
                         break
-
-            opp_pred = self._predict_opponent_next_heads(opponent, steps=3) if opponent else []
-            min_opp_dist = min((get_distance(my_h, p) for p in opp_pred), default=float('inf'))
-            danger_score = 0.0
-            if min_opp_dist < 2:
-                if opp_b and len(opp_b) >= len(my_b):
-                    danger_score = -self.danger_weight * (2.0 - min_opp_dist)
+                    scale *= discount
+                    if my_b[0] in food_set and my_b[0] not in eaten:
+                        eaten.add(my_b[0])
+                        reward += food_reward * scale
                 else:
-                    danger_score = -self.danger_weight * 0.4 * (2.0 - min_opp_dist)
-
-            total = food_score + area_score + astar_bonus + length_score + trap_score + danger_score
-            return total
-
-        def predict_opponent_moves(opp_h, opp_b, my_b):
-            moves = self._available_moves_from(opp_h, opp_b, my_b)
-            if not moves:
-                return [ (0,0) ]
-            scored = []
-            for mv in moves:
-                nxt = (opp_h[0] + mv[0], opp_h[1] + mv[1])
-                dfood = min((get_distance(nxt, f) for f in food_list), default=float('inf'))
-                scored.append( (dfood, mv) )
-            scored.sort(key=lambda x: x[0])
-            return [m for _,m in scored[:3]]
-
-        def minimax(my_h, my_b, opp_h, opp_b, depth, alpha, beta, maximizing_player):
-            if time.time() - start_time > self.time_budget:
-                return heuristic(my_h, my_b, opp_h, opp_b)
-            if depth == 0:
-                return heuristic(my_h, my_b, opp_h, opp_b)
-
-            if maximizing_player:
-                val = -float('inf')
-                moves = self._available_moves_from(my_h, my_b, opp_b)
-                if not moves:
-                    return -1e6
-                for mv in moves:
-                    nxt_h, nxt_b = self._simulate_step(my_h, my_b, mv)
-                    if not (0 <= nxt_h[0] < GRID_WIDTH and 0 <= nxt_h[1] < GRID_HEIGHT):
-                        continue
-                    if tuple(nxt_h) in set(tuple(s) for s in nxt_b[1:]):
-                        continue
-                    if opp_b and tuple(nxt_h) in set(tuple(s) for s in opp_b):
-                        continue
-                    v = minimax(nxt_h, nxt_b, opp_h, opp_b, depth-1, alpha, beta, False)
-                    val = max(val, v)
-                    alpha = max(alpha, val)
-                    if alpha >= beta:
-                        break
-                return val
-            else:
-                val = float('inf')
-                if not opp_h:
-                    return heuristic(my_h, my_b, opp_h, opp_b)
-                moves = predict_opponent_moves(opp_h, opp_b, my_b)
-                if not moves:
-                    return heuristic(my_h, my_b, opp_h, opp_b)
-                for mv in moves:
-                    nxt_opp_h, nxt_opp_b = self._simulate_step(opp_h, opp_b, mv)
-                    if not (0 <= nxt_opp_h[0] < GRID_WIDTH and 0 <= nxt_opp_h[1] < GRID_HEIGHT):
-                        continue
-                    if tuple(nxt_opp_h) in set(tuple(s) for s in nxt_opp_b[1:]):
-                        continue
-                    if tuple(nxt_opp_h) in set(tuple(s) for s in my_b):
-                        v = -1e5
-                    else:
-                        v = minimax(my_h, my_b, nxt_opp_h, nxt_opp_b, depth-1, alpha, beta, True)
-                    val = min(val, v)
-                    beta = min(beta, val)
-                    if alpha >= beta:
-                        break
-                return val
-
-        try:
-            score = minimax(tuple(my_head), my_body, tuple(opp_head) if opp_head else None, opp_body, depth, -float('inf'), float('inf'), True)
-        except Exception:
-            score = -1e6
-        return score
-
-    def get_possible_moves(self, snake: Snake) -> List[Tuple[int,int]]:
-        cur = snake.direction if snake.direction is not None else Direction.RIGHT
-        candidates = [Direction.RIGHT, Direction.LEFT, Direction.UP, Direction.DOWN]
-        return [m for m in candidates if m != Direction.opposite(cur)]
\ No newline at end of file
+                    moves = self._available_moves_from(my_b[0], occ)
+                    if moves:
+                        value = max(self._leaf_value(snake, my_b, opp_b, random.choice(moves), start_t, traps_set, food_list, opp_pred),
+                                    self.death_score) + reward
+
+            # Backpropagation
+            for n in path:
+                n.visits += 1
+                n.value += value
+
+        return {mv: child.value / child.visits for mv, child in root.children.items()}
+
+    def _playout_step(self, my_b: deque, opp_b: deque, occ: bytearray, move: Tuple[int, int]) -> bool:
+        """Advance our snake by move and the opponent by a random free move; False if we crash"""
+        head = my_b[0]
+        nxt = (head[0] + move[0], head[1] + move[1])
+        head_i = nxt[0] * _STRIDE + nxt[1]
+        if occ[head_i]:
+            return False
+        tail = my_b.pop()
+        occ[tail[0] * _STRIDE + tail[1]] -= 1
+        occ[head_i] += 1
+        my_b.appendleft(nxt)
+        if opp_b:
+            moves = self._available_moves_from(opp_b[0], occ)
+            if moves:
+                mv = random.choice(moves)
+                head = opp_b[0]
+                nxt = (head[0] + mv[0], head[1] + mv[1])
+                tail = opp_b.pop()
+                occ[tail[0] * _STRIDE + tail[1]] -= 1
+                occ[nxt[0] * _STRIDE + nxt[1]] += 1
+                opp_b.appendleft(nxt)
+        return True
+
+    def _leaf_value(self, snake, my_b, opp_b, move, start_t, traps_set, food_list, opp_pred) -> float:
+        """Minimax leaf value after move from a rollout position"""
+        # _minimax_score caches its starting position's grid for the root moves; each rollout starts elsewhere
+        self._root_grid = None
+        me = SimpleNamespace(segments=my_b, shield_timer=snake.shield_timer)
+        opp = SimpleNamespace(segments=opp_b, alive=bool(opp_b))
+        return self._minimax_score(me, opp, None, None, move, 0, start_t, traps_set, food_list, opp_pred)
+
+
+class UserBot(CustomBot):
+    """The contest entry: CustomBot's search under its own name"""
+    def __init__(self, name: str = "ChampionBot"):
+        super().__init__()
+        self.name = name
@@ -1,22 +1,104 @@
 import os
 import importlib
 import sys
-from typing import List, Dict, Tuple
+import random
+from typing import List, Dict, Tuple, Callable, Iterable, Optional
 import csv
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from tournament import Tournament
+from game_settings import GameState
 from main import SnakeGame
 
+
+def run_game(seed: int, bot_factory_a: Callable, bot_factory_b: Callable,
+             name_a: str = "Snake1", name_b: str = "Snake2",
+             max_rounds: int = 3, round_time: int = 20) -> Dict:
+    """Play one headless match and return its result (safe to run in a worker process)"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    random.seed(seed)
+
+    game = SnakeGame()
+    # Results come back to the caller; parallel workers must not all rewrite the same CSV
+    game.results_file = None
+    game.bot1 = bot_factory_a()
+    game.bot2 = bot_factory_b()
+    game.bot1.name = name_a
+    game.bot2.name = name_b
+    game.config.max_rounds = max_rounds
+    game.config.round_time = round_time
+    game.start_new_tournament()
+
+    # Step the game loop without drawing or waiting for key presses
+    while game.game_state != GameState.GAME_OVER:
+        if game.game_state == GameState.ROUND_OVER:
+            game.start_next_round()
+        game.update()
+        game.clock.tick(60)
+
+    return {
+        "seed": seed,
+        "bot1": name_a,
+        "bot2": name_b,
+        "bot1_score": game.tournament.total_snake1_apples,
+        "bot2_score": game.tournament.total_snake2_apples,
+        "winner": game.final_winner,
+        "rounds_played": len(game.tournament.results)
+    }
+
+
+def load_bot(bot_file: str) -> Optional[Dict]:
+    """Import one AI_Course_Contest bot file and return its contest entry, or None if it has no UserBot"""
+    try:
+        # Extract names from filename
+        parts = bot_file[:-3].split("_")  # Remove .py and split
+        name1, name2 = parts[0], parts[1]
+
+        # Import the module
+        module_name = f"AI_Course_Contest.{bot_file[:-3]}"
+        spec = importlib.util.spec_from_file_location(module_name, f"AI_Course_Contest/{bot_file}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
+        # Get the UserBot class
+        if hasattr(module, "UserBot"):
+            bot_class = module.UserBot
+            bot_name = getattr(bot_class, "name", f"{name1}_{name2}")
+
+            return {
+                "class": bot_class,
+                "name": bot_name,
+                "filename": bot_file,
+                "authors": f"{name1} & {name2}",
+                "wins": 0,
+                "losses": 0,
+                "points": 0
+            }
+
+    except Exception as e:
+        print(f"Error loading {bot_file}: {str(e)}")
+    return None
+
+
+def play_pairing(files: Tuple[str, str], seed: int = 0) -> Dict:
+    """Play one headless match between two contest bot files, importing them here (for worker processes)"""
+    bot1, bot2 = load_bot(files[0]), load_bot(files[1])
+    return run_game(seed, bot1["class"], bot2["class"], name_a=bot1["name"], name_b=bot2["name"])
+
+
 class Contest:
     def __init__(self):
         self.bots: List[Dict] = [] 
         self.leaderboard: List[Dict] = []
+        # Set whenever bots or their stats change; the leaderboard is only re-sorted then
+        self._leaderboard_dirty = True
         self.tournament_results = []
 
     def discover_bots(self) -> List[Dict]:
         """Scan AI_Course_Contest folder for valid bot files"""
         bot_files = []
-        bots = []
         
         if not os.path.exists("AI_Course_Contest"):
             os.makedirs("AI_Course_Contest")
@@ -26,42 +108,15 @@ class Contest:
             if file.endswith(".py") and file.count("_") >= 2:  # name1_name2_bot.py format
                 bot_files.append(file)
 
-        for bot_file in bot_files:
-            try:
-                # Extract names from filename
-                parts = bot_file[:-3].split("_")  # Remove .py and split
-                name1, name2 = parts[0], parts[1]
-                
-                # Import the module
-                module_name = f"AI_Course_Contest.{bot_file[:-3]}"
-                spec = importlib.util.spec_from_file_location(module_name, f"AI_Course_Contest/{bot_file}")
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[module_name] = module
-                spec.loader.exec_module(module)
-                
-                # Get the UserBot class
-                if hasattr(module, "UserBot"):
-                    bot_class = module.UserBot
-                    bot_name = getattr(bot_class, "name", f"{name1}_{name2}")
-                    
-                    bots.append({
-                        "class": bot_class,
-                        "name": bot_name,
-                        "filename": bot_file,
-                        "authors": f"{name1} & {name2}",
-                        "wins": 0,
-                        "losses": 0,
-                        "points": 0  
-                    })
-                    
-            except Exception as e:
-                print(f"Error loading {bot_file}: {str(e)}")
-                continue
+        # Bot files import independently, so load them side by side (map keeps listing order)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            bots = [bot for bot in ex.map(load_bot, bot_files) if bot is not None]
 
         if not bots:
             raise Exception("No valid bots found in AI_Course_Contest folder")
             
         self.bots = bots
+        self._leaderboard_dirty = True
         return bots
 
     def run_match(self, bot1: Dict, bot2: Dict) -> Dict:
@@ -89,7 +144,11 @@ class Contest:
             "rounds_played": len(game.tournament.results)
         }
         
-        # Update bot stats
+        self._record_result(bot1, bot2, result)
+        return result
+
+    def _record_result(self, bot1: Dict, bot2: Dict, result: Dict) -> None:
+        """Update both bots' stats from a match result"""
         if result["winner"] == bot1["name"]:
             bot1["wins"] += 1
             bot1["points"] += 3
@@ -103,7 +162,14 @@ class Contest:
             bot2["points"] += 1
             
         self.tournament_results.append(result)
-        return result
+        self._leaderboard_dirty = True
+
+    def run_games(self, bot1: Dict, bot2: Dict, seeds: Iterable[int]) -> List[Dict]:
+        """Play one headless match per seed in parallel worker processes"""
+        # Workers re-import both bots from their files (contest classes don't unpickle elsewhere)
+        play = partial(play_pairing, (bot1["filename"], bot2["filename"]))
+        with ProcessPoolExecutor() as ex:
+            return list(ex.map(play, seeds))
 
     def round_robin_tournament(self):
         """Run a round-robin tournament where each bot plays every other bot"""
@@ -119,6 +185,27 @@ class Contest:
         self.update_leaderboard()
         self.save_results()
 
+    def parallel_round_robin_tournament(self):
+        """Round robin with every match played headless at once in worker processes"""
+        self.discover_bots()
+        num_bots = len(self.bots)
+        pairs = [(i, j) for i in range(num_bots) for j in range(i+1, num_bots)]
+
+        print(f"\nStarting Parallel Round Robin Tournament with {num_bots} bots ({len(pairs)} matches)")
+
+        # Workers get filenames, not classes: bots loaded from contest files only unpickle where they were imported
+        files = [(self.bots[i]["filename"], self.bots[j]["filename"]) for i, j in pairs]
+        with ProcessPoolExecutor() as ex:
+            results = list(ex.map(play_pairing, files, range(len(pairs))))
+
+        # Stats are only touched here, in match order
+        for (i, j), result in zip(pairs, results):
+            print(f"{result['bot1']} vs {result['bot2']}: {result['winner'] or 'Draw'}")
+            self._record_result(self.bots[i], self.bots[j], result)
+
+        self.update_leaderboard()
+        self.save_results()
+
     def knockout_tournament(self):
         """Run a knockout tournament with losers bracket"""
         self.discover_bots()
@@ -185,6 +272,9 @@ class Contest:
 
     def update_leaderboard(self):
         """Update the leaderboard based on current results"""
+        if not self._leaderboard_dirty:
+            return
+        self._leaderboard_dirty = False
         self.leaderboard = sorted(
             self.bots,
             key=lambda x: (-x["points"], -x["wins"], x["losses"])
@@ -196,8 +286,7 @@ class Contest:
 
     def save_results(self, filename: str = "contest_results.csv"):
         """Save tournament results to CSV"""
-        if not self.leaderboard:
-            self.update_leaderboard()
+        self.update_leaderboard()
             
         fieldnames = [
             "rank", "name", "authors", "wins", "losses", "points",
@@ -205,26 +294,15 @@ class Contest:
         ]
         
         with open(filename, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for bot in self.leaderboard:
-                writer.writerow({
-                    "rank": bot["rank"],
-                    "name": bot["name"],
-                    "authors": bot["authors"],
-                    "wins": bot["wins"],
-                    "losses": bot["losses"],
-                    "points": bot["points"],
-                    "filename": bot["filename"]
-                })
+            writer = csv.writer(file)
+            writer.writerow(fieldnames)
+            writer.writerows([bot[field] for field in fieldnames] for bot in self.leaderboard)
         
         print(f"\nResults saved to {filename}")
 
     def print_leaderboard(self):
         """Print a formatted leaderboard to console"""
-        if not self.leaderboard:
-            self.update_leaderboard()
+        self.update_leaderboard()
             
         print("\n=== FINAL LEADERBOARD ===")
         print(f"{'Rank':<5} {'Bot Name':<20} {'Authors':<20} {'Wins':<5} {'Losses':<7} {'Points':<7}")
@@ -240,13 +318,16 @@ if __name__ == "__main__":
     print("Select tournament type:")
     print("1. Round Robin (each bot plays every other bot)")
     print("2. Knockout (single elimination with losers bracket)")
+    print("3. Round Robin, headless with matches run in parallel")
     
-    choice = input("Enter choice (1 or 2): ")
+    choice = input("Enter choice (1, 2 or 3): ")
     
     if choice == "1":
         contest.round_robin_tournament()
     elif choice == "2":
         contest.knockout_tournament()
+    elif choice == "3":
+        contest.parallel_round_robin_tournament()
     else:
         print("Invalid choice, defaulting to Round Robin")
         contest.round_robin_tournament()
@@ -3,6 +3,8 @@ from enum import Enum, auto
 import pygame
 from typing import Tuple, List, Deque, Optional
 from collections import deque
+from itertools import islice
+from functools import lru_cache
 import random
 import math
 
@@ -13,6 +15,8 @@ GRID_WIDTH = WIDTH // GRID_SIZE
 GRID_HEIGHT = HEIGHT // GRID_SIZE
 SNAKE_SPEED = 10
 WALL_THICKNESS = 10
+# Cells food, traps and snakes may spawn on (everything but the outermost ring)
+SPAWN_CELLS = tuple((x, y) for x in range(1, GRID_WIDTH - 1) for y in range(1, GRID_HEIGHT - 1))
 
 # Colors
 BLACK = (0, 0, 0)
@@ -64,6 +68,67 @@ class Direction:
     def opposite(direction: Tuple[int, int]) -> Tuple[int, int]:
         return (-direction[0], -direction[1])
 
+# Head triangle corners (nose first) and (left, right) eye positions, relative to the head cell's center
+_HALF, _QUARTER = GRID_SIZE // 2, GRID_SIZE // 4
+HEAD_POLY_OFFSETS = {
+    Direction.RIGHT: ((_HALF, 0), (-_HALF, -_HALF), (-_HALF, _HALF)),
+    Direction.LEFT: ((-_HALF, 0), (_HALF, -_HALF), (_HALF, _HALF)),
+    Direction.UP: ((0, -_HALF), (-_HALF, _HALF), (_HALF, _HALF)),
+    Direction.DOWN: ((0, _HALF), (-_HALF, -_HALF), (_HALF, -_HALF)),
+}
+EYE_OFFSETS = {
+    Direction.RIGHT: ((-_QUARTER, -_QUARTER), (-_QUARTER, _QUARTER)),
+    Direction.LEFT: ((_QUARTER, -_QUARTER), (_QUARTER, _QUARTER)),
+    Direction.UP: ((-_QUARTER, _QUARTER), (_QUARTER, _QUARTER)),
+    Direction.DOWN: ((-_QUARTER, -_QUARTER), (_QUARTER, -_QUARTER)),
+}
+
+# Cell-sized sprites are drawn once, on first use, and blitted for every item after that.
+# They live here rather than on the objects so game objects stay picklable
+@lru_cache(maxsize=None)
+def food_sprite() -> pygame.Surface:
+    sprite = pygame.Surface((GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
+    center = GRID_SIZE // 2
+    # Apple
+    pygame.draw.circle(sprite, RED, (center, center), GRID_SIZE // 2 - 2)
+    # Stem
+    pygame.draw.rect(sprite, DARK_GREEN, (center - 2, center - GRID_SIZE // 2, 4, GRID_SIZE // 4))
+    return sprite
+
+@lru_cache(maxsize=None)
+def trap_sprite() -> pygame.Surface:
+    sprite = pygame.Surface((GRID_SIZE, GRID_SIZE), pygame.SRCALPHA)
+    center, arm = GRID_SIZE // 2, GRID_SIZE // 4
+    # Purple trap circle
+    pygame.draw.circle(sprite, PURPLE, (center, center), GRID_SIZE // 3)
+    # X mark
+    pygame.draw.line(sprite, BLACK, (center - arm, center - arm), (center + arm, center + arm), 3)
+    pygame.draw.line(sprite, BLACK, (center + arm, center - arm), (center - arm, center + arm), 3)
+    return sprite
+
+@lru_cache(maxsize=None)
+def body_sprite(color: Tuple[int, int, int]) -> pygame.Surface:
+    sprite = pygame.Surface((GRID_SIZE, GRID_SIZE))
+    sprite.fill(color)
+    return sprite
+
+@lru_cache(maxsize=None)
+def head_sprite(color: Tuple[int, int, int], direction: Tuple[int, int]) -> pygame.Surface:
+    # One pixel of margin all round: the nose reaches the edge of the next cell
+    sprite = pygame.Surface((GRID_SIZE + 2, GRID_SIZE + 2), pygame.SRCALPHA)
+    center = _HALF + 1
+    pygame.draw.polygon(sprite, color, [(center + dx, center + dy) for dx, dy in HEAD_POLY_OFFSETS[direction]])
+
+    # Eyes
+    eye_size = GRID_SIZE // 5
+    pupil_size = eye_size // 2
+    eyes = [(center + dx, center + dy) for dx, dy in EYE_OFFSETS[direction]]
+    for eye in eyes:
+        pygame.draw.circle(sprite, WHITE, eye, eye_size)
+    for eye in eyes:
+        pygame.draw.circle(sprite, BLACK, eye, pupil_size)
+    return sprite
+
 class GameObject:
     def draw(self, surface: pygame.Surface) -> None:
         raise NotImplementedError
@@ -81,7 +146,9 @@ class Snake(GameObject):
         self.reset(start_x, start_y)
         
     def reset(self, start_x: int, start_y: int) -> None:
-        self.segments: Deque[List[int]] = deque([[start_x, start_y]])
+        self.segments: Deque[Tuple[int, int]] = deque([(start_x, start_y)])
+        # Cells under the segments, kept in step with every segment added or removed
+        self._occupied = {(start_x, start_y)}
         self.direction = Direction.RIGHT
         self.next_direction = Direction.RIGHT
         self.speed = SNAKE_SPEED
@@ -98,15 +165,22 @@ class Snake(GameObject):
         self.collisions = 0
         self.collision_types = []
 
-    def get_head_position(self) -> List[int]:
-        return self.segments[0][:]
+    def get_head_position(self) -> Tuple[int, int]:
+        return self.segments[0]
 
     def check_self_collision(self) -> bool:
         """Returns True if the snake collides with itself"""
-        return self.segments.count(self.get_head_position()) > 1
+        # A head that ran into the body is never added to the set, leaving it a cell short
+        return len(self._occupied) < len(self.segments)
+
+    def pop_tail(self) -> Tuple[int, int]:
+        """Remove and return the last segment"""
+        tail = self.segments.pop()
+        self._occupied.discard(tail)
+        return tail
 
-    def get_body_positions(self) -> List[List[int]]:
-        return [segment[:] for segment in self.segments[1:]]
+    def get_body_positions(self) -> List[Tuple[int, int]]:
+        return list(islice(self.segments, 1, None))
 
     def update(self, dt:float) -> bool:
         if not self.alive:
@@ -126,10 +200,10 @@ class Snake(GameObject):
             self.direction = self.next_direction
             
             head_x, head_y = self.segments[0]
-            new_head = [
+            new_head = (
                 head_x + self.direction[0],
                 head_y + self.direction[1]
-            ]
+            )
             
             # Wall collision
             if (new_head[0] < 0 or new_head[0] >= GRID_WIDTH or 
@@ -144,15 +218,15 @@ class Snake(GameObject):
                 self.grow -= 1
                 self.length += 1
             else:
-                self.segments.pop()
-
-            # Self collision
-            for segment in list(self.segments)[1:]:
-                if new_head == segment:
-                    self.alive = False
-                    self.self_collision = True
-                    self.death_time = pygame.time.get_ticks() / 1000.0  # Record death time
-                    return False
+                self.pop_tail()
+
+            # Self collision (the tail has already moved out of the way)
+            if new_head in self._occupied:
+                self.alive = False
+                self.self_collision = True
+                self.death_time = pygame.time.get_ticks() / 1000.0  # Record death time
+                return False
+            self._occupied.add(new_head)
         return True
     
     def check_collision_with_other(self, other_snake: 'Snake') -> bool:
@@ -173,7 +247,7 @@ class Snake(GameObject):
                 if self.score > other_snake.score:
                     other_snake.score = max(0, other_snake.score - penalty)
                     if len(other_snake.segments) > self.config.min_snake_length:
-                        other_snake.segments.pop()
+                        other_snake.pop_tail()
                         other_snake.length -= 1
                         
                     other_snake.shield_timer = self.config.shield_duration
@@ -181,7 +255,7 @@ class Snake(GameObject):
                 elif other_snake.score > self.score:
                     self.score = max(0, self.score - penalty)
                     if len(self.segments) > self.config.min_snake_length:
-                        self.segments.pop()
+                        self.pop_tail()
                         self.length -= 1
                     self.shield_timer = self.config.shield_duration
                     
@@ -189,11 +263,11 @@ class Snake(GameObject):
                     self.score = max(0, self.score - penalty)
                     other_snake.score = max(0, other_snake.score - penalty)
                     if len(self.segments) > self.config.min_snake_length:
-                        self.segments.pop()
+                        self.pop_tail()
                         self.length -= 1
                         
                     if len(other_snake.segments) > self.config.min_snake_length:
-                        other_snake.segments.pop()
+                        other_snake.pop_tail()
                         other_snake.length -= 1
 
                     self.shield_timer = self.config.shield_duration
@@ -201,96 +275,98 @@ class Snake(GameObject):
                         
                 return True
 
-        # Body collision
-        for segment in list(other_snake.segments)[1:]:
-            if head == segment:
-                self.collisions += 1
-                self.collision_types.append("body") 
-                for _ in range(self.config.collision_segment_penalty):  
-                    self.score = max(0, self.score - self.config.body_collision_penalty)
-                    if len(self.segments) > self.config.min_snake_length:
-                        self.segments.pop()
-                        self.length -= 1
-                        
-                    self.shield_timer = self.config.shield_duration
+        # Body collision (the occupied set also holds the other head, so only scan the body when the heads meet)
+        if head in other_snake._occupied and (head != other_head or head in islice(other_snake.segments, 1, None)):
+            self.collisions += 1
+            self.collision_types.append("body") 
+            for _ in range(self.config.collision_segment_penalty):  
+                self.score = max(0, self.score - self.config.body_collision_penalty)
+                if len(self.segments) > self.config.min_snake_length:
+                    self.pop_tail()
+                    self.length -= 1
+                    
+                self.shield_timer = self.config.shield_duration
 
-                return True
+            return True
         return False
     
     def change_direction(self, new_dir: Tuple[int, int]) -> None:
         """preventing 180-degree turns"""
+        # Bots may return [dx, dy] lists; direction-keyed lookups need a hashable tuple
+        new_dir = tuple(new_dir)
         if new_dir != Direction.opposite(self.direction):
             self.next_direction = new_dir
 
     def draw(self, surface: pygame.Surface) -> None:
-        for i, segment in enumerate(self.segments):
-            # Alternate body colors for a stripe pattern
-            color = self.color_primary if i % 2 == 0 else self.color_secondary
+        # Body squares, alternating colors for a stripe pattern
+        stripes = (body_sprite(self.color_primary), body_sprite(self.color_secondary))
+        body = [
+            (stripes[i & 1], (segment[0] * GRID_SIZE, segment[1] * GRID_SIZE))
+            for i, segment in enumerate(islice(self.segments, 1, None), 1)
+        ]
+        shielded = self.shield_timer > 0 and self.shield_flash < 0.5
 
+        for i, segment in enumerate(self.segments):
             # Convert grid position to pixel position
             pixel_x = segment[0] * GRID_SIZE + GRID_SIZE // 2
             pixel_y = segment[1] * GRID_SIZE + GRID_SIZE // 2
 
-            if self.shield_timer > 0 and self.shield_flash < 0.5:
-                shield_color = SHIELD_BLUE
+            if shielded:
+                # Shield rings spill into the neighbouring cells, so keep ring/square order per segment
                 pygame.draw.circle(
-                    surface, shield_color,
+                    surface, SHIELD_BLUE,
                     (pixel_x, pixel_y), 
                     GRID_SIZE//2 + 2, 2
                 )
-                
-            # Draw body or head
-            if i == 0:  # Head with pointy nose
-                cx, cy = pixel_x, pixel_y
-                half = GRID_SIZE // 2
-                if self.direction == (1, 0):  # Right
-                    points = [(cx + half, cy), (cx - half, cy - half), (cx - half, cy + half)]
-                elif self.direction == (-1, 0):  # Left
-                    points = [(cx - half, cy), (cx + half, cy - half), (cx + half, cy + half)]
-                elif self.direction == (0, -1):  # Up
-                    points = [(cx, cy - half), (cx - half, cy + half), (cx + half, cy + half)]
-                else:  # Down
-                    points = [(cx, cy + half), (cx - half, cy - half), (cx + half, cy - half)]
-
-                pygame.draw.polygon(surface, self.color_primary, points)
-
-                # Eyes
-                eye_size = GRID_SIZE // 5
-                pupil_size = eye_size // 2
-
-                if self.direction == (1, 0):  # Right
-                    left_eye_pos = (pixel_x - GRID_SIZE//4, pixel_y - GRID_SIZE//4)
-                    right_eye_pos = (pixel_x - GRID_SIZE//4, pixel_y + GRID_SIZE//4)
-                elif self.direction == (-1, 0):  # Left
-                    left_eye_pos = (pixel_x + GRID_SIZE//4, pixel_y - GRID_SIZE//4)
-                    right_eye_pos = (pixel_x + GRID_SIZE//4, pixel_y + GRID_SIZE//4)
-                elif self.direction == (0, 1):  # Down
-                    left_eye_pos = (pixel_x - GRID_SIZE//4, pixel_y - GRID_SIZE//4)
-                    right_eye_pos = (pixel_x + GRID_SIZE//4, pixel_y - GRID_SIZE//4)
-                else:  # Up
-                    left_eye_pos = (pixel_x - GRID_SIZE//4, pixel_y + GRID_SIZE//4)
-                    right_eye_pos = (pixel_x + GRID_SIZE//4, pixel_y + GRID_SIZE//4)
-
-                pygame.draw.circle(surface, WHITE, left_eye_pos, eye_size)
-                pygame.draw.circle(surface, WHITE, right_eye_pos, eye_size)
-                pygame.draw.circle(surface, BLACK, left_eye_pos, pupil_size)
-                pygame.draw.circle(surface, BLACK, right_eye_pos, pupil_size)
-            else:
-                # Body
-                pygame.draw.rect(
-                    surface,
-                    color,
-                    (segment[0] * GRID_SIZE, segment[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                )
+                if i > 0:
+                    surface.blit(*body[i - 1])
+
+            # Draw head
+            if i == 0:  # Head with pointy nose and eyes
+                surface.blit(head_sprite(self.color_primary, self.direction),
+                             (pixel_x - _HALF - 1, pixel_y - _HALF - 1))
+
+                if not shielded:
+                    # Without rings in between, the whole body goes out in one call after the head
+                    surface.blits(body, False)
+                    break
     
     
     
-class Food(GameObject):
+class GridItems(GameObject):
+    """Items lying on grid cells: a tuple of positions plus a set of their cells for O(1) hit tests"""
+    @property
+    def positions(self) -> Tuple[Tuple[int, int], ...]:
+        # Read-only so the set can't go stale; change items through the setter, add() or take()
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions: List[Tuple[int, int]]) -> None:
+        self._positions = tuple(positions)
+        self._cells = set(self._positions)
+
+    def add(self, cell: Tuple[int, int]) -> None:
+        """Place one more item on cell, e.g. the position returned by spawn()"""
+        self._positions += (cell,)
+        self._cells.add(cell)
+
+    def take(self, cell: Tuple[int, int]) -> bool:
+        """Remove the item on cell and return True, or return False if there is none"""
+        if cell not in self._cells:
+            return False
+        i = self._positions.index(cell)
+        self._positions = self._positions[:i] + self._positions[i + 1:]
+        if cell not in self._positions:
+            self._cells.discard(cell)
+        return True
+
+
+class Food(GridItems):
     def __init__(self, num_foods: int = 1):
         self.num_foods = num_foods
-        self.positions: List[Tuple[int, int]] = []
+        self.positions = []
 
-    def spawn(self, snake_segments: Optional[List[List[int]]] = None) -> Optional[Tuple[int, int]]:
+    def spawn(self, snake_segments: Optional[List[Tuple[int, int]]] = None) -> Optional[Tuple[int, int]]:
         """Spawn a single food item in a valid position"""
         attempts = 0
         max_attempts = 100
@@ -312,53 +388,32 @@ class Food(GameObject):
 
         return None
 
-    def spawn_multiple(self, num_foods: int, snake_segments: Optional[List[List[int]]] = None) -> None:
+    def spawn_multiple(self, num_foods: int, snake_segments: Optional[List[Tuple[int, int]]] = None) -> None:
         """Spawn multiple food items"""
-        self.positions = []
-        for _ in range(num_foods):
-            new_food = self.spawn(snake_segments)
-            if new_food:
-                self.positions.append(new_food)
+        self.positions = sample_free_cells(num_foods, set(snake_segments or ()))
 
-    def check_collision(self, head_position: List[int]) -> bool:
+    def check_collision(self, head_position: Tuple[int, int]) -> bool:
         """Check if snake head collides with food"""
-        for i, pos in enumerate(self.positions):
-            if head_position == [pos[0], pos[1]]:
-                self.positions.pop(i)
-                return True
-        return False
+        return self.take((head_position[0], head_position[1]))
 
     def draw(self, surface: pygame.Surface) -> None:
         """Draw all food items"""
-        for pos in self.positions:
-            pixel_x = pos[0] * GRID_SIZE + GRID_SIZE // 2
-            pixel_y = pos[1] * GRID_SIZE + GRID_SIZE // 2
-
-            # Draw apple
-            pygame.draw.circle(
-                surface, RED,
-                (pixel_x, pixel_y),
-                GRID_SIZE // 2 - 2
-            )
-            # Draw stem
-            pygame.draw.rect(
-                surface, DARK_GREEN,
-                (pixel_x - 2, pixel_y - GRID_SIZE // 2, 4, GRID_SIZE // 4)
-            )
+        sprite = food_sprite()
+        surface.blits([(sprite, (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE)) for pos in self.positions], False)
 
-class Trap(GameObject):
+class Trap(GridItems):
     def __init__(self, num_traps: int = 3):
         self.config = GameConfig()
         self.num_traps = num_traps
-        self.positions: List[Tuple[int, int]] = []
+        self.positions = []
         self.traps_hit = 0
         
     def get_positions(self) -> List[Tuple[int, int]]:
         """Return list of all trap positions (similar to Food class)"""
-        return self.positions.copy()
+        return list(self.positions)
 
     def spawn(self, 
-          snake_segments: Optional[List[List[int]]] = None,
+          snake_segments: Optional[List[Tuple[int, int]]] = None,
           food_positions: Optional[List[Tuple[int, int]]] = None) -> Optional[Tuple[int, int]]:
         """Spawn a single trap in a valid position"""
         attempts = 0
@@ -387,68 +442,49 @@ class Trap(GameObject):
 
     def spawn_multiple(self, 
                   num_traps: int, 
-                  snake_segments: Optional[List[List[int]]] = None,
+                  snake_segments: Optional[List[Tuple[int, int]]] = None,
                   food_positions: Optional[List[Tuple[int, int]]] = None) -> None:
         """Spawn multiple traps"""
-        self.positions = []
-        for _ in range(num_traps):
-            new_trap = self.spawn(snake_segments, food_positions)
-            if new_trap:
-                self.positions.append(new_trap)
+        occupied = set(snake_segments or ())
+        occupied.update(food_positions or ())
+        self.positions = sample_free_cells(num_traps, occupied)
 
     def check_collision(self, snake: Snake) -> bool:
         """Check if snake collides with trap"""
-        head = snake.get_head_position()
-        for i, pos in enumerate(self.positions):
-            if head == [pos[0], pos[1]]:
-                self.traps_hit += 1
-                snake.traps_hit += 1
-                # Apply more severe penalty to score
-                snake.score = max(0, snake.score - (self.config.trap_penalty))  # Double penalty
-                
-                # Reduce length more aggressively (remove 2 segments if possible)
-                for _ in range(self.config.trap_segment_penalty):
-                    if len(snake.segments) > self.config.min_snake_length:
-                        if snake.grow > 0:
-                            snake.grow -= 1  # First reduce any pending growth
-                        else:
-                            snake.segments.pop()
-                        snake.length -= 1
-                
-                # Activate shield
-                snake.shield_timer = self.config.shield_duration
-                
-                # Remove the trap that was hit
-                self.positions.pop(i)
-                
-                return True
-        return False
+        # Remove the trap that was hit, if any
+        if not self.take(snake.get_head_position()):
+            return False
+
+        self.traps_hit += 1
+        snake.traps_hit += 1
+        # Apply more severe penalty to score
+        snake.score = max(0, snake.score - (self.config.trap_penalty))  # Double penalty
+        
+        # Reduce length more aggressively (remove 2 segments if possible)
+        for _ in range(self.config.trap_segment_penalty):
+            if len(snake.segments) > self.config.min_snake_length:
+                if snake.grow > 0:
+                    snake.grow -= 1  # First reduce any pending growth
+                else:
+                    snake.pop_tail()
+                snake.length -= 1
+        
+        # Activate shield
+        snake.shield_timer = self.config.shield_duration
+        
+        return True
 
     def draw(self, surface: pygame.Surface) -> None:
         """Draw all traps"""
-        for pos in self.positions:
-            pixel_x = pos[0] * GRID_SIZE + GRID_SIZE // 2
-            pixel_y = pos[1] * GRID_SIZE + GRID_SIZE // 2
-
-            # Draw purple trap circle
-            pygame.draw.circle(
-                surface, PURPLE,
-                (pixel_x, pixel_y),
-                GRID_SIZE // 3
-            )
-            # Draw X mark
-            pygame.draw.line(
-                surface, BLACK,
-                (pixel_x - GRID_SIZE // 4, pixel_y - GRID_SIZE // 4),
-                (pixel_x + GRID_SIZE // 4, pixel_y + GRID_SIZE // 4),
-                3
-            )
-            pygame.draw.line(
-                surface, BLACK,
-                (pixel_x + GRID_SIZE // 4, pixel_y - GRID_SIZE // 4),
-                (pixel_x - GRID_SIZE // 4, pixel_y + GRID_SIZE // 4),
-                3
-            )
+        sprite = trap_sprite()
+        surface.blits([(sprite, (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE)) for pos in self.positions], False)
+
+def sample_free_cells(count: int, occupied: set) -> List[Tuple[int, int]]:
+    """Up to count distinct random spawn cells, none of them in occupied"""
+    # A random sample with enough spare cells to cover every occupied one, minus those,
+    # is still a uniform pick among the free cells and needs no retries
+    draw = min(count + len(occupied), len(SPAWN_CELLS))
+    return [cell for cell in random.sample(SPAWN_CELLS, draw) if cell not in occupied][:count]
 
 def get_distance(pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
     return math.hypot(pos1[0] - pos2[0], pos1[1] - pos2[1])
@@ -456,17 +492,13 @@ def get_distance(pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
 def generate_spawn_positions() -> Tuple[Tuple[int, int], Tuple[int, int], List[Tuple[int, int]]]:
     s1 = (random.randint(1, GRID_WIDTH - 2), random.randint(1, GRID_HEIGHT - 2))
     s2 = (random.randint(1, GRID_WIDTH - 2), random.randint(1, GRID_HEIGHT - 2))
-    while get_distance(s1, s2) < 5:  # Ensure snakes spawn apart
+    while (s1[0] - s2[0]) ** 2 + (s1[1] - s2[1]) ** 2 < 25:  # Ensure snakes spawn at least 5 cells apart
         s2 = (random.randint(1, GRID_WIDTH - 2), random.randint(1, GRID_HEIGHT - 2))
     
-    fruit_positions = []
-    while len(fruit_positions) < 30:
-        pos = (random.randint(1, GRID_WIDTH - 2), random.randint(1, GRID_HEIGHT - 2))
-        if pos not in fruit_positions and pos != s1 and pos != s2:
-            fruit_positions.append(pos)
+    fruit_positions = sample_free_cells(30, {s1, s2})
     return s1, s2, fruit_positions
 
-def is_safe(snake: Snake, new_head_pos: List[int], other_snake: Optional[Snake] = None) -> bool:
+def is_safe(snake: Snake, new_head_pos: Tuple[int, int], other_snake: Optional[Snake] = None) -> bool:
     """
     Check if a position is safe for the snake to move to
     Args:
@@ -476,20 +508,20 @@ def is_safe(snake: Snake, new_head_pos: List[int], other_snake: Optional[Snake]
     Returns:
         bool: True if position is safe, False otherwise
     """
+    # Segments are (x, y) tuples; accept any pair
+    cell = (new_head_pos[0], new_head_pos[1])
+
     # Check wall collision
-    if not (0 <= new_head_pos[0] < GRID_WIDTH and 0 <= new_head_pos[1] < GRID_HEIGHT):
+    if not (0 <= cell[0] < GRID_WIDTH and 0 <= cell[1] < GRID_HEIGHT):
         return False
 
-    # Check self-collision (excluding the neck)
-    for segment in list(snake.segments)[1:]:
-        if new_head_pos == segment:
-            return False
+    # Check self-collision (excluding the head; a head that ran into the body also covers a body cell)
+    if cell in snake._occupied and (cell != snake.segments[0] or snake.check_self_collision()):
+        return False
 
     # Check collision with other snake
-    if other_snake:
-        for segment in other_snake.segments:
-            if new_head_pos == segment:
-                return False
+    if other_snake and cell in other_snake._occupied:
+        return False
 
     return True
 
@@ -30,6 +30,8 @@ class SnakeGame:
         self.current_round = 1
         self.round_winner: Optional[str] = None
         self.final_winner: Optional[str] = None
+        # Where the finished tournament's rounds are saved (None skips saving, e.g. for headless matches)
+        self.results_file: Optional[str] = "tournament_results.csv"
         
         # Initialize tournament tracking
         self.tournament = Tournament(self.config)
@@ -287,7 +289,8 @@ class SnakeGame:
 
         if self.tournament.is_tournament_over():
             self.final_winner = self.tournament.get_winner()
-            self.tournament.save_to_csv()
+            if self.results_file:
+                self.tournament.save_to_csv(self.results_file)
             self.show_final_results()
             self.game_state = GameState.GAME_OVER
         else: